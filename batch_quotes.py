@@ -0,0 +1,110 @@
+"""Birden fazla müşteri için toplu fiyat teklifi üretimi
+
+Kullanım:
+    python batch_quotes.py musteriler.csv urunler.csv -o teklifler.zip
+
+Müşteri CSV sütunları: company, contact (isteğe bağlı)
+Ürün CSV sütunları: name, unit_price, vat_rate (varsayılan 1), quantity ve category (isteğe bağlı)
+"""
+import argparse
+import csv
+import io
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import quote_pdf
+from product_store import ProductStore
+from quote_history import QuoteHistory
+
+
+def read_customers_csv(f):
+    """Müşteri CSV'sini (company, contact) oku"""
+    customers = []
+    for row in csv.DictReader(f):
+        company = (row.get('company') or '').strip()
+        if company:
+            customers.append((company, (row.get('contact') or '').strip()))
+    return customers
+
+
+def read_products_csv(f):
+    """Ürün CSV'sini (name, unit_price, vat_rate, quantity, category) ürün deposuna oku"""
+    records = [row for row in csv.DictReader(f) if (row.get('name') or '').strip()]
+    return ProductStore.from_records(records)
+
+
+def _archive_name(company, used):
+    slug = re.sub(r'[^\w]+', '_', company, flags=re.UNICODE).strip('_') or 'musteri'
+    name = f"fiyat_teklifi_{slug}.pdf"
+    n = 2
+    while name in used:
+        name = f"fiyat_teklifi_{slug}_{n}.pdf"
+        n += 1
+    used.add(name)
+    return name
+
+
+def _build_job(company, contact, products, today, quote_no):
+    return quote_pdf.build_quote_pdf(company, contact, products, today, quote_no=quote_no)
+
+
+def write_quotes_zip(customers, products, out, max_workers=None, today=None, history=None):
+    """Her müşteri için PDF üretip sonuçları tamamlandıkça ZIP'e yaz
+
+    İşçi süreçleri başlangıçta font, stil ve filigranı bir kez yükler;
+    aynı süreçteki tüm işler bunları paylaşır. history verilirse teklif
+    numaraları arşivin sayacından alınır ve her teklif arşive eklenir.
+    """
+    today = today or datetime.now()
+    used = set()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive, \
+            ProcessPoolExecutor(max_workers=max_workers, initializer=quote_pdf.preload) as pool:
+        futures = {}
+        for company, contact in customers:
+            quote_no = history.next_quote_no(today) if history else None
+            future = pool.submit(_build_job, company, contact, products, today, quote_no)
+            futures[future] = (company, contact, quote_no)
+        for future in as_completed(futures):
+            company, contact, quote_no = futures[future]
+            archive.writestr(_archive_name(company, used), future.result())
+            if history:
+                history.record(quote_no, today, company, contact, products)
+    return len(futures)
+
+
+def build_quotes_zip(customers, products, max_workers=None, today=None, history=None):
+    """Toplu teklifleri ZIP olarak bayt şeklinde döndür"""
+    buffer = io.BytesIO()
+    write_quotes_zip(customers, products, buffer, max_workers=max_workers, today=today, history=history)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Toplu fiyat teklifi üretimi")
+    parser.add_argument('customers', help="Müşteri CSV dosyası (company, contact)")
+    parser.add_argument('products', help="Ürün CSV dosyası (name, unit_price, vat_rate)")
+    parser.add_argument('-o', '--output', default='teklifler.zip', help="Çıktı ZIP dosyası")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="İşçi süreç sayısı")
+    parser.add_argument('--no-history', action='store_true', help="Teklifleri arşive kaydetme")
+    args = parser.parse_args(argv)
+
+    with open(args.customers, newline='', encoding='utf-8-sig') as f:
+        customers = read_customers_csv(f)
+    with open(args.products, newline='', encoding='utf-8-sig') as f:
+        products = read_products_csv(f)
+
+    if not customers or not products:
+        parser.error("En az bir müşteri ve bir ürün gerekli")
+
+    with open(args.output, 'wb') as out:
+        history = None if args.no_history else QuoteHistory()
+        count = write_quotes_zip(customers, products, out, max_workers=args.jobs, history=history)
+    print(f"{count} teklif oluşturuldu: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Ölçüm betiklerinin ortak yardımcıları"""
+import os
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from product_store import ProductStore  # noqa: E402
+
+
+def make_products(n, mixed=False):
+    """n satırlık ürün deposu
+
+    mixed: KDV oranları karışık ve satırların yarısında miktar var (toplamlar
+    tablosu da çizilir); verilmezse tüm satırlar %1 KDV'li ve miktarsız.
+    """
+    return ProductStore.from_records(
+        {'name': f'Ürün {i}', 'unit_price': 100.0 + i,
+         'vat_rate': (1.0, 10.0, 20.0)[i % 3] if mixed else 1.0,
+         'quantity': 1 + i % 7 if mixed and i % 2 == 0 else None}
+        for i in range(n)
+    )
+
+
+def use_data_dir(path):
+    """Katalog, arşiv ve PDF önbelleğini path altına yönlendir
+
+    Modüller bu yolları içe aktarılırken okur; uygulama modülleri
+    yüklenmeden önce çağrılmalı. Ölçümler kullanıcının kataloğuna ve
+    arşivine yazmaz, teklif numarası sayacını ilerletmez.
+    """
+    os.environ['FIYAT_CATALOG_DB'] = os.path.join(path, 'katalog.db')
+    os.environ['FIYAT_HISTORY_DB'] = os.path.join(path, 'teklifler.db')
+    os.environ['FIYAT_CACHE_DIR'] = os.path.join(path, 'cache')
+
+
+def best_of(fn, repeat):
+    """fn'i repeat kez çalıştır, en kısa süreyi saniye olarak döndür"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
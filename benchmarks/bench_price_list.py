@@ -0,0 +1,76 @@
+"""Fiyat listesi içe aktarma hızı (satır/saniye)
+
+Kullanım:
+    python benchmarks/bench_price_list.py [--rows 100000] [--chunksize 10000]
+
+Geçici bir CSV ve XLSX üretilir; teklif listesine ve geçici bir kataloğa
+aktarma süreleri ölçülür.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog  # noqa: E402
+from price_list import import_price_list  # noqa: E402
+from product_store import ProductStore  # noqa: E402
+
+
+def make_price_list(n):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'Ürün Adı': [f'Ürün {i}' for i in range(n)],
+        'Fiyat': rng.uniform(-1, 500, n).round(2),  # ~%0.2 negatif fiyat
+        'KDV': rng.choice([1, 10, 20, 120], n, p=[0.5, 0.3, 0.19, 0.01]),
+    })
+    frame.loc[::1000, 'Ürün Adı'] = 'Ürün 1'  # yinelenen adlar
+    return frame
+
+
+def run(label, path, sink_factory, chunksize):
+    sink, finish = sink_factory()
+    with open(path, 'rb') as f:
+        start = time.perf_counter()
+        result = import_price_list(f, path, sink, chunksize=chunksize)
+        finish()
+        elapsed = time.perf_counter() - start
+    print(f"{label:<24} {result['rows']:>8} {result['imported']:>9} "
+          f"{sum(result['error_counts'].values()):>6} {result['rows'] / elapsed:>12,.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--chunksize', type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        frame = make_price_list(args.rows)
+        csv_path = os.path.join(tmp, 'fiyatlar.csv')
+        xlsx_path = os.path.join(tmp, 'fiyatlar.xlsx')
+        frame.to_csv(csv_path, index=False, sep=';', decimal=',')
+        frame.to_excel(xlsx_path, index=False)
+
+        def store_sink():
+            store = ProductStore()
+            return store.extend, lambda: None
+
+        def catalog_sink():
+            catalog = Catalog(os.path.join(tmp, f'katalog_{time.perf_counter_ns()}.db'))
+            return (lambda chunk: catalog.upsert_many(chunk.to_dict('records'), reload=False),
+                    catalog.reload)
+
+        print(f"{'kaynak -> hedef':<24} {'satır':>8} {'aktarılan':>9} {'hata':>6} {'satır/sn':>12}")
+        run("CSV -> teklif listesi", csv_path, store_sink, args.chunksize)
+        run("CSV -> katalog", csv_path, catalog_sink, args.chunksize)
+        run("XLSX -> teklif listesi", xlsx_path, store_sink, args.chunksize)
+
+
+if __name__ == '__main__':
+    main()
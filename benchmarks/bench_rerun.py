@@ -0,0 +1,46 @@
+"""Ürün listesi boyutuna göre Streamlit betiğinin yeniden çalışma süresi
+
+Kullanım:
+    python benchmarks/bench_rerun.py [--script fiyat-uygulamasi.py] [--repeat 5]
+
+Tarayıcı gerekmez; betik streamlit.testing AppTest ile çalıştırılır.
+Katalog, arşiv ve önbellek geçici bir klasörde tutulur.
+Karşılaştırma için eski bir sürüm --script ile verilebilir:
+    git show HEAD~1:fiyat-uygulamasi.py > /tmp/eski.py
+    python benchmarks/bench_rerun.py --script /tmp/eski.py
+"""
+import argparse
+import os
+import tempfile
+
+from streamlit.testing.v1 import AppTest
+
+from _common import APP_DIR, best_of, make_products, use_data_dir
+
+LIST_SIZES = [10, 50, 100, 250]
+
+
+def run(args):
+    print(f"{'ürün':>6} {'widget':>7} {'yeniden çalışma (ms)':>21}")
+    for n in LIST_SIZES:
+        at = AppTest.from_file(os.path.abspath(args.script), default_timeout=120)
+        at.session_state['products'] = make_products(n)
+        at.run()  # ilk çalışma: önbellekler ve içe aktarmalar
+        elapsed = best_of(at.run, args.repeat)
+        widgets = len(at.button) + len(at.text_input) + len(at.number_input)
+        print(f"{n:>6} {widgets:>7} {elapsed * 1000:>21.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--script', default=os.path.join(APP_DIR, 'fiyat-uygulamasi.py'))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        use_data_dir(tmp)
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
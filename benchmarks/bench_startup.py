@@ -0,0 +1,104 @@
+"""Streamlit betiğinin açılışta içe aktardığı modüllerin süresi (-X importtime)
+
+Kullanım:
+    python benchmarks/bench_startup.py [--repeat 5]
+    python benchmarks/bench_startup.py --rev HEAD~1
+
+Betiğin modül düzeyindeki import satırları yeni bir Python sürecinde
+-X importtime ile çalıştırılır; her tekrarda önbellek sıcak olsun diye
+önce bir ısınma turu atılır. --rev verilirse aynı ölçüm o sürümün
+ağacında (git archive) da yapılır ve iki sonuç yan yana yazdırılır.
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = 'fiyat-uygulamasi.py'
+
+# Açılışta yüklenmemesi gereken ağır paketler
+HEAVY_PACKAGES = ['reportlab', 'PIL', 'concurrent.futures.process', 'http.server', 'cProfile']
+
+
+def startup_imports(tree_dir):
+    """Betiğin modül düzeyindeki import satırlarını kaynak olarak döndür"""
+    with open(os.path.join(tree_dir, SCRIPT), encoding='utf-8') as f:
+        source = f.read()
+    module = ast.parse(source)
+    return "\n".join(ast.get_source_segment(source, node) for node in module.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def importtime(tree_dir, code):
+    """(tüm modüller, doğrudan içe aktarılanlar) -> kümülatif µs"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=tree_dir,
+                            capture_output=True, text=True, check=True)
+    modules = {}
+    top_level = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        cumulative = int(cumulative)
+        modules[name.strip()] = cumulative
+        if not name[1:].startswith(' '):  # girintisiz: doğrudan içe aktarılan
+            top_level[name.strip()] = cumulative
+    return modules, top_level
+
+
+def measure(tree_dir, repeat):
+    code = startup_imports(tree_dir)
+    importtime(tree_dir, code)  # ısınma (.pyc ve disk önbelleği)
+    # Yorumlayıcının kendi açılış modülleri (site, encodings...) sayılmaz
+    interpreter = set(importtime(tree_dir, 'pass')[1])
+    runs = []
+    for _ in range(repeat):
+        modules, top_level = importtime(tree_dir, code)
+        runs.append((modules, {name: us for name, us in top_level.items() if name not in interpreter}))
+    total_ms = statistics.median(sum(top.values()) for _, top in runs) / 1000
+    modules, top_level = runs[-1]
+    top_level = {name: us / 1000 for name, us in top_level.items()}
+    heavy = [name for name in HEAVY_PACKAGES if name in modules]
+    return total_ms, top_level, heavy
+
+
+def export_tree(rev, target):
+    archive = subprocess.run(['git', 'archive', '--format=tar', rev], cwd=APP_DIR,
+                             capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as f:
+        f.write(archive)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(target, filter='data')
+
+
+def report(label, total_ms, top_level, heavy):
+    print(f"\n{label}: toplam {total_ms:.0f} ms")
+    for name, ms in sorted(top_level.items(), key=lambda item: -item[1])[:12]:
+        print(f"  {name:<28} {ms:>8.1f} ms")
+    print(f"  açılışta yüklenen ağır paketler: {', '.join(heavy) or '-'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--rev', default=None, help="Karşılaştırılacak git sürümü (örn. HEAD~1)")
+    args = parser.parse_args(argv)
+
+    current = measure(APP_DIR, args.repeat)
+    report("Çalışma ağacı", *current)
+    if args.rev:
+        with tempfile.TemporaryDirectory() as tmp:
+            export_tree(args.rev, tmp)
+            previous = measure(tmp, args.repeat)
+        report(args.rev, *previous)
+        print(f"\nKazanç: {previous[0] - current[0]:.0f} ms ({previous[0]:.0f} -> {current[0]:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Teklif hattı için tekrarlanabilir ölçüm takımı (pytest-benchmark)
+
+Kullanım:
+    python -m pytest benchmarks/bench_suite.py --benchmark-autosave
+    python -m pytest benchmarks/bench_suite.py --benchmark-compare --benchmark-compare-fail=min:10%
+    python -m pytest benchmarks/bench_suite.py -k "pdf and 500"
+
+pytest-benchmark gerekir (pip install pytest-benchmark). Tarayıcı ve
+Streamlit gerekmez; PDF ve ürün deposu modülleri doğrudan çalıştırılır.
+Ölçülenler:
+- soğuk başlangıç: yeni süreçte quote_pdf içe aktarma, load_turkish_font
+  ve şablon hazırlama (adımlar extra_info'da)
+- küçük ve büyük logo için filigran hazırlama
+- 1/50/500/5000 satır için PDF oluşturma süresi; boyut ve tracemalloc
+  tepe belleği extra_info'da
+- ürün paneli tablosunun (editor_frame) oluşturulması
+- 1000 ürün x 3 para birimi x 4 kademe fiyat matrisinin hesaplanması
+
+Sonuçlar benchmarks/results/ altına commit kimliğiyle kaydedilir
+(benchmarks/conftest.py); --benchmark-compare son kayıtla karşılaştırır,
+--benchmark-compare-fail gerilemede çıkış kodunu 1 yapar.
+"""
+import json
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime
+
+import pytest
+from PIL import Image
+
+from _common import APP_DIR, make_products
+
+import quote_pdf
+from pricing import Pricing
+from product_store import ProductStore
+
+pytest.importorskip('pytest_benchmark')
+
+ROW_COUNTS = [1, 50, 500, 5000]
+LOGO_SIZES = {'small': 256, 'large': 4000}
+TODAY = datetime(2024, 1, 1, 12, 0)
+PRICING_ROWS = 1000
+# Kur tablosu gerekmesin diye sabit kurlar
+PRICING = Pricing(['TRY', 'EUR', 'USD'], [(1, 0), (25, 5), (100, 7.5), (1000, 10)],
+                  {'TRY': 1.0, 'EUR': 35.12, 'USD': 32.48}, TODAY.date())
+
+# Yeni süreçte ölçülen başlangıç adımları (ms cinsinden JSON yazar)
+COLD_START = """
+import json, time
+t0 = time.perf_counter()
+import quote_pdf
+t1 = time.perf_counter()
+quote_pdf.load_turkish_font()
+t2 = time.perf_counter()
+quote_pdf.get_template()
+t3 = time.perf_counter()
+print(json.dumps({'import': (t1 - t0) * 1000, 'fonts': (t2 - t1) * 1000, 'template': (t3 - t2) * 1000}))
+"""
+
+
+def cold_start():
+    out = subprocess.run([sys.executable, '-c', COLD_START], cwd=APP_DIR,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+@pytest.mark.benchmark(group='startup')
+def test_cold_start(benchmark):
+    steps = benchmark.pedantic(cold_start, rounds=3, iterations=1)
+    benchmark.extra_info.update({f'{step}_ms': ms for step, ms in steps.items()})
+
+
+@pytest.mark.benchmark(group='watermark')
+@pytest.mark.parametrize('label', LOGO_SIZES)
+def test_watermark(benchmark, tmp_path, label):
+    path = str(tmp_path / f'logo_{label}.png')
+    Image.new('RGBA', (LOGO_SIZES[label],) * 2, (220, 60, 60, 255)).save(path)
+    # lru_cache atlanır: her tekrar gerçekten hazırlar
+    benchmark(quote_pdf.load_watermark.__wrapped__, path, 0)
+
+
+@pytest.mark.benchmark(group='pdf')
+@pytest.mark.parametrize('rows', ROW_COUNTS)
+def test_pdf_build(benchmark, rows):
+    quote_pdf.preload()
+    products = make_products(rows, mixed=True)
+
+    def build():
+        return quote_pdf.build_quote_pdf('Müşteri', 'İlgili', products, TODAY, quote_no='BLD-1')
+
+    pdf = benchmark(build)
+    tracemalloc.start()
+    try:
+        build()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info.update({'size_bytes': len(pdf), 'peak_kb': round(peak / 1024, 1)})
+
+
+@pytest.mark.benchmark(group='panel')
+@pytest.mark.parametrize('rows', ROW_COUNTS)
+def test_editor_frame(benchmark, rows):
+    frame = make_products(rows, mixed=True).frame
+    # Her tekrar yeni depo: düzenleme sonrası yeniden hesaplama dahil
+    benchmark(lambda: ProductStore(frame).editor_frame())
+
+
+@pytest.mark.benchmark(group='pricing')
+def test_pricing_matrix(benchmark):
+    benchmark(PRICING.matrix_cents, make_products(PRICING_ROWS, mixed=True))
+
+
+@pytest.mark.benchmark(group='pricing')
+def test_pricing_table_rows(benchmark):
+    benchmark(PRICING.table_rows, make_products(PRICING_ROWS, mixed=True))
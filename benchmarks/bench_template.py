@@ -0,0 +1,45 @@
+"""Şablon önbelleğinin teklif başına çizim süresine etkisi
+
+Kullanım:
+    python benchmarks/bench_template.py [--repeat 5]
+
+"önce": her teklif için stiller ve sabit içerik yeniden oluşturulur
+"sonra": süreç genelinde paylaşılan şablon kullanılır
+"""
+import argparse
+from datetime import datetime
+
+from _common import best_of, make_products
+
+import quote_pdf
+
+ROW_COUNTS = [10, 100, 1000]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    fonts = quote_pdf.load_turkish_font()
+    watermark = quote_pdf.get_watermark()
+    today = datetime(2024, 1, 1, 12, 0)
+
+    print(f"{'satır':>6} {'önce (ms)':>10} {'sonra (ms)':>11} {'fark':>7}")
+    for n in ROW_COUNTS:
+        products = make_products(n)
+
+        def before():
+            quote_pdf.QuoteTemplate(*fonts).render('Müşteri', 'İlgili', products, today, watermark)
+
+        def after():
+            quote_pdf.get_template().render('Müşteri', 'İlgili', products, today, watermark)
+
+        after()  # şablonu ısıt
+        t_before = best_of(before, args.repeat) * 1000
+        t_after = best_of(after, args.repeat) * 1000
+        print(f"{n:>6} {t_before:>10.2f} {t_after:>11.2f} {t_before / t_after:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+"""Ölçüm sonuçları benchmarks/results/ altında saklanır"""
+import os
+
+import pytest
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # --benchmark-storage verilmediyse varsayılan ./.benchmarks yerine
+    if getattr(config.option, 'benchmark_storage', None) == 'file://./.benchmarks':
+        config.option.benchmark_storage = f'file://{RESULTS_DIR}'
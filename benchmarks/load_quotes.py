@@ -0,0 +1,105 @@
+"""Teklif servisi yük testi
+
+Kullanım:
+    python benchmarks/load_quotes.py [--requests 200] [--concurrency 8] [--rows 30]
+    python benchmarks/load_quotes.py --url http://127.0.0.1:8502/quotes
+
+--url verilmezse servis bu süreçte boş bir portta, arşiv ve önbellek
+olmadan başlatılır (her istek gerçekten çizilir). Her istek farklı
+müşteri adı taşır. p50/p99 gecikme, saniyedeki teklif ve 503 ile
+geri çevrilen istek sayısı yazdırılır.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quote_service  # noqa: E402
+
+
+def make_payload(i, rows):
+    return {
+        'customer': f'Müşteri {i}',
+        'contact': 'İlgili Kişi',
+        'products': [
+            {'name': f'Ürün {n}', 'unit_price': 100.0 + n, 'vat_rate': 1.0, 'quantity': 1 + n % 5}
+            for n in range(rows)
+        ],
+    }
+
+
+def post(url, payload):
+    """(HTTP durum kodu, süre sn) döndür"""
+    data = json.dumps(payload).encode('utf-8')
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        exc.read()
+        status = exc.code
+    except OSError:
+        status = 0  # bağlantı kurulamadı / sıfırlandı
+    return status, time.perf_counter() - start
+
+
+def percentile(values, p):
+    if len(values) < 2:
+        return values[0] if values else float('nan')
+    return statistics.quantiles(values, n=100, method='inclusive')[p - 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default=None, help="Çalışan servisin /quotes adresi")
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rows', type=int, default=30, help="Teklif başına ürün satırı")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Yerel servisin işçi sayısı")
+    parser.add_argument('--max-pending', type=int, default=None, help="Yerel servisin bekleyen iş sınırı")
+    args = parser.parse_args(argv)
+
+    server = service = None
+    url = args.url
+    if url is None:
+        service = quote_service.QuoteService(workers=args.jobs, max_pending=args.max_pending)
+        server = quote_service.make_server(service, port=0, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/quotes"
+        post(url, make_payload(-1, args.rows))  # işçileri ısıt
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(lambda i: post(url, make_payload(i, args.rows)), range(args.requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+            service.shutdown()
+
+    ok = sorted(duration * 1000 for status, duration in results if status == 200)
+    rejected = sum(1 for status, _ in results if status == 503)
+    failed = len(results) - len(ok) - rejected
+    print(f"adres: {url}")
+    print(f"istek: {len(results)}  eşzamanlı: {args.concurrency}  satır: {args.rows}")
+    print(f"başarılı: {len(ok)}  503 (meşgul): {rejected}  diğer hata: {failed}")
+    if ok:
+        print(f"p50: {percentile(ok, 50):.1f} ms  p99: {percentile(ok, 99):.1f} ms  "
+              f"en fazla: {ok[-1]:.1f} ms")
+    print(f"teklif/sn: {len(ok) / elapsed:.1f}")
+
+
+if __name__ == '__main__':
+    main()
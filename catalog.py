@@ -0,0 +1,169 @@
+"""Ürün kataloğu
+
+Ürünler (ad, varsayılan kilogram fiyatı, KDV oranı, kategori) SQLite'ta
+saklanır. Arama için bellekte Türkçe büyük/küçük harf katlamalı bir önek
+dizini ve üçlü harf (trigram) tabanlı bulanık dizin tutulur.
+"""
+import bisect
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Katalog veritabanı (FIYAT_CATALOG_DB ile değiştirilebilir)
+CATALOG_DB = os.environ.get("FIYAT_CATALOG_DB", os.path.join(APP_DIR, "katalog.db"))
+
+# İlk açılışta eklenen ürünler (eski hızlı ürün butonları)
+DEFAULT_PRODUCTS = [
+    ("Yağlı Pul Biber", 0.0, 1.0, "Biber"),
+    ("İpek Pul Biber", 0.0, 1.0, "Biber"),
+    ("Halis Pul Biber", 0.0, 1.0, "Biber"),
+    ("İsot", 0.0, 1.0, "Biber"),
+    ("Kekik", 0.0, 1.0, "Baharat"),
+    ("Köri", 0.0, 1.0, "Baharat"),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    unit_price REAL NOT NULL DEFAULT 0,
+    vat_rate REAL NOT NULL DEFAULT 1,
+    category TEXT NOT NULL DEFAULT ''
+)
+"""
+
+_ASCII_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+
+def fold_turkish(text):
+    """Türkçe kurallarıyla küçük harfe çevir ve aksanları kaldır (İ/I -> i)"""
+    text = text.replace("İ", "i").replace("I", "ı").lower()
+    return text.translate(_ASCII_FOLD).strip()
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CatalogIndex:
+    """Katalog ürünleri üzerinde önek ve bulanık arama dizini"""
+
+    def __init__(self, items):
+        self.items = items
+        self._prefix = []
+        self._trigrams = {}
+        for idx, item in enumerate(items):
+            key = fold_turkish(item['name'])
+            # Tam ad ve her kelime önek dizinine girer ("pul" -> "İpek Pul Biber")
+            for token in {key, *key.split()}:
+                self._prefix.append((token, idx))
+            for gram in _trigrams(key):
+                self._trigrams.setdefault(gram, []).append(idx)
+        self._prefix.sort()
+
+    def search(self, query, limit=10):
+        """Sorguya uyan ürünleri döndür: önce önek eşleşmeleri, sonra bulanık"""
+        key = fold_turkish(query)
+        if not key:
+            return self.items[:limit]
+
+        found = []
+        seen = set()
+        pos = bisect.bisect_left(self._prefix, (key, -1))
+        while (pos < len(self._prefix) and len(found) < limit
+               and self._prefix[pos][0].startswith(key)):
+            idx = self._prefix[pos][1]
+            if idx not in seen:
+                seen.add(idx)
+                found.append(idx)
+            pos += 1
+
+        if len(found) < limit:
+            grams = _trigrams(key)
+            scores = {}
+            for gram in grams:
+                for idx in self._trigrams.get(gram, ()):
+                    if idx not in seen:
+                        scores[idx] = scores.get(idx, 0) + 1
+            threshold = max(1, len(grams) // 2)
+            fuzzy = sorted((idx for idx, score in scores.items() if score >= threshold),
+                           key=lambda i: -scores[i])
+            found.extend(fuzzy[:limit - len(found)])
+
+        return [self.items[idx] for idx in found[:limit]]
+
+
+class Catalog:
+    """SQLite'ta saklanan ürün kataloğu ve bellek içi arama dizini"""
+
+    def __init__(self, path=CATALOG_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+            if conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 0:
+                conn.executemany(
+                    "INSERT INTO products (name, unit_price, vat_rate, category) VALUES (?, ?, ?, ?)",
+                    DEFAULT_PRODUCTS,
+                )
+        self.reload()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def reload(self):
+        """Ürünleri veritabanından okuyup arama dizinini yeniden kur"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT name, unit_price, vat_rate, category FROM products ORDER BY name"
+            ).fetchall()
+        items = [
+            {'name': name, 'unit_price': unit_price, 'vat_rate': vat_rate, 'category': category}
+            for name, unit_price, vat_rate, category in rows
+        ]
+        self.index = CatalogIndex(items)
+
+    def __len__(self):
+        return len(self.index.items)
+
+    def search(self, query, limit=10):
+        return self.index.search(query, limit)
+
+    def upsert_many(self, products, reload=True):
+        """Ürünleri ekle veya ada göre güncelle, ardından dizini yenile
+
+        Toplu aktarımda parçalar reload=False ile yazılır, dizin sonda bir
+        kez yenilenir.
+        """
+        rows = [
+            (p['name'], p['unit_price'], p['vat_rate'], p.get('category', ''))
+            for p in products
+        ]
+        with self._lock:
+            with self._connect() as conn:
+                conn.executemany(
+                    """INSERT INTO products (name, unit_price, vat_rate, category)
+                       VALUES (?, ?, ?, ?)
+                       ON CONFLICT(name) DO UPDATE SET
+                           unit_price = excluded.unit_price,
+                           vat_rate = excluded.vat_rate,
+                           category = CASE WHEN excluded.category != ''
+                                           THEN excluded.category ELSE products.category END""",
+                    rows,
+                )
+            if reload:
+                self.reload()
+
+    def upsert(self, name, unit_price, vat_rate, category=''):
+        self.upsert_many([{'name': name, 'unit_price': unit_price,
+                           'vat_rate': vat_rate, 'category': category}])
@@ -1,55 +1,190 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
-import os
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from PIL import Image as PILImage
+from datetime import datetime, timedelta
+from functools import partial
 import io
-import base64
-import urllib.request
+import html
+import json
+import os
+import time
+from streamlit import runtime
+
+import timings
+from catalog import Catalog
+from pdf_jobs import PdfJobs
+from price_list import import_price_list, export_price_list
+import pricing
+from product_store import ProductStore
+from quote_cache import QuoteCache, quote_key
+from quote_history import QuoteHistory
+from quotes import issue_quote
+
+# PDF motoru (reportlab, PIL, font, şablon, filigran) - açılışta değil,
+# ilk PDF istendiğinde yüklenir ve süreç genelinde paylaşılır
+@st.cache_resource(show_spinner="PDF motoru hazırlanıyor...")
+def load_pdf_engine():
+    """PDF modülünü içe aktarıp font, şablon ve filigranı hazırla"""
+    import quote_pdf
+    quote_pdf.preload()
+    return quote_pdf
 
-# Türkçe destekli font yükleme
+# Arka plan PDF işleri - süreç genelinde paylaşılan iş parçacığı havuzu
 @st.cache_resource
-def load_turkish_font():
-    """Türkçe karakterleri destekleyen font yükle"""
-    try:
-        # DejaVu Sans fontunu indir ve yükle (Türkçe karakterler desteklenir)
-        font_url = "https://github.com/dejavu-fonts/dejavu-fonts/raw/master/ttf/DejaVuSans.ttf"
-        bold_font_url = "https://github.com/dejavu-fonts/dejavu-fonts/raw/master/ttf/DejaVuSans-Bold.ttf"
-        
-        # Fontları indir
-        urllib.request.urlretrieve(font_url, "DejaVuSans.ttf")
-        urllib.request.urlretrieve(bold_font_url, "DejaVuSans-Bold.ttf")
-        
-        # ReportLab'a kaydet
-        pdfmetrics.registerFont(TTFont('TurkishFont', 'DejaVuSans.ttf'))
-        pdfmetrics.registerFont(TTFont('TurkishFont-Bold', 'DejaVuSans-Bold.ttf'))
-        
-        return 'TurkishFont', 'TurkishFont-Bold'
-        
-    except Exception as e:
-        st.warning(f"Türkçe font yüklenemedi: {e}. Standart font kullanılacak.")
-        return 'Helvetica', 'Helvetica-Bold'
-
-# Font yükle
-FONT_NORMAL, FONT_BOLD = load_turkish_font()
-
-# Sayfa ayarları
-st.set_page_config(
-    page_title="Buldumlar Biber & Baharat - Fiyat Teklifi",
-    page_icon="🌶️",
-    layout="wide"
-)
-
-# CSS stil
-st.markdown("""
+def load_pdf_jobs():
+    """Arka planda PDF oluşturan iş havuzunu başlat"""
+    return PdfJobs()
+
+# Ürün kataloğu - süreç başına bir kez yüklenir
+@st.cache_resource
+def load_catalog():
+    """SQLite ürün kataloğunu ve arama dizinini yükle"""
+    return Catalog()
+
+# PDF önbelleği - süreç genelinde paylaşılır
+@st.cache_resource
+def load_quote_cache():
+    """Bellek + disk katmanlı PDF önbelleğini oluştur"""
+    return QuoteCache()
+
+# Teklif arşivi - süreç genelinde paylaşılır
+@st.cache_resource
+def load_history():
+    """SQLite teklif arşivini aç"""
+    return QuoteHistory()
+
+# Aşama süreleri - FIYAT_TIMING_LOG ile JSON günlüğü, FIYAT_METRICS_PORT ile /metrics
+@st.cache_resource
+def start_timings():
+    """Süre günlüğünü ve isteğe bağlı Prometheus adresini süreç başına bir kez başlat"""
+    timings.configure_logging()
+    port = os.environ.get("FIYAT_METRICS_PORT")
+    return timings.start_metrics_server(int(port)) if port else None
+
+def reset_history_page():
+    """Geçmiş filtresi değişince ilk sayfaya dön"""
+    st.session_state.history_page = 0
+
+def format_catalog_item(item):
+    return f"{item['name']} · {item['unit_price']:.2f} TL/kg · %{item['vat_rate']:.0f}"
+
+# Ürün tablosu düzenleyici sütunları -> ürün deposu alanları
+EDITOR_FIELDS = {
+    'Ürün Adı': 'name',
+    'Kategori': 'category',
+    'KDV Hariç (TL/kg)': 'unit_price',
+    'KDV %': 'vat_rate',
+    'Miktar (kg)': 'quantity',
+}
+
+def apply_editor_changes(frame, changes):
+    """Tablo düzenleyicisinin değişikliklerini (düzenleme, ekleme, silme, sıra) tek seferde uygula"""
+    frame = frame.copy()
+    frame['order'] = range(1, len(frame) + 1)
+    frame['moved'] = False
+    
+    for row, edits in changes.get('edited_rows', {}).items():
+        row = int(row)
+        for column, value in edits.items():
+            if column == 'Sıra' and value is not None:
+                frame.at[row, 'order'] = value
+                frame.at[row, 'moved'] = True
+            elif column in EDITOR_FIELDS and (value is not None or column in ('Miktar (kg)', 'Kategori')):
+                frame.at[row, EDITOR_FIELDS[column]] = value
+    
+    added = pd.DataFrame(changes.get('added_rows', []))
+    if not added.empty:
+        added = added.rename(columns=EDITOR_FIELDS).reindex(columns=[*EDITOR_FIELDS.values(), 'Sıra'])
+        added['order'] = added.pop('Sıra').fillna(pd.Series(range(len(frame) + 1, len(frame) + 1 + len(added))))
+        added['moved'] = False
+        frame = pd.concat([frame, added], ignore_index=True)
+    
+    frame = frame.drop(index=changes.get('deleted_rows', []), errors='ignore')
+    frame = frame[frame['name'].fillna('').astype(str).str.strip() != '']
+    # Yeni sıra numarası verilen satır, aynı numaralı satırın önüne geçer
+    frame = frame.assign(position=range(len(frame))).sort_values(
+        ['order', 'moved', 'position'], ascending=[True, False, True])
+    return frame.drop(columns=['order', 'moved', 'position'])
+
+def apply_product_edits():
+    """Ürün tablosu değiştiğinde ürün deposunu güncelle ve tabloyu yenile"""
+    changes = st.session_state[f"products_editor_{st.session_state.editor_version}"]
+    products = st.session_state.products
+    with timings.span('ui.apply_edits'):
+        products.set_frame(apply_editor_changes(products.frame, changes))
+    st.session_state.editor_version += 1
+
+def register_pdf_url(pdf_data):
+    """PDF'i Streamlit medya sunucusuna kaydedip adresini döndür
+    
+    Aynı bayt içeriği aynı adresi verir; her yeniden çalışmada yalnızca
+    kısa adres tarayıcıya gider, PDF bir kez sunucudan indirilir.
+    """
+    with timings.span('ui.pdf_url'):
+        # Dikkat: media_file_mgr Streamlit'in özel (belgelenmemiş) API'sidir,
+        # sürüm yükseltmelerinde kontrol edilmeli
+        url = runtime.get_instance().media_file_mgr.add(pdf_data, "application/pdf", "pdf_transport")
+        # Dönen adres köke göredir ("/media/..."); Streamlit öğeleri taban yolunu
+        # kendisi ekler, ham HTML ve iframe için server.baseUrlPath elle eklenir
+        base_path = (st.get_option("server.baseUrlPath") or "").strip("/")
+        return f"/{base_path}{url}" if base_path else url
+
+@st.fragment(run_every=0.5)
+def show_pdf_job():
+    """Arka plandaki PDF işinin ilerlemesi; bitince sonucu alıp sayfayı yenile"""
+    jobs = load_pdf_jobs()
+    job = jobs.get(st.session_state.pdf_job)
+    if job is None:  # sunucu yeniden başlamış olabilir
+        st.session_state.pdf_job = None
+        return
+    
+    if job.finished:
+        jobs.pop(job.id)
+        st.session_state.pdf_job = None
+        if job.state == 'done':
+            quote_no, st.session_state.pdf_data = job.result
+            st.session_state.pdf_filename = f"fiyat_teklifi_{quote_no}.pdf"
+            st.session_state.quote_timings = job.spans
+            if job.profile_result:
+                st.session_state.profile_result = job.profile_result
+            st.session_state.pdf_message = ('success', "PDF başarıyla oluşturuldu!")
+        elif job.state == 'failed':
+            st.session_state.pdf_message = ('error', f"PDF oluşturma hatası: {job.error}")
+        else:
+            st.session_state.pdf_message = ('info', "PDF oluşturma iptal edildi.")
+        st.rerun()
+    
+    label = "PDF sırada bekliyor..." if job.state == 'queued' else f"PDF oluşturuluyor... {job.pages} sayfa"
+    with st.status(label, state='running', expanded=True):
+        fraction = min(job.rows / job.total_rows, 1.0) if job.total_rows else 0.0
+        st.progress(fraction, text=f"{job.rows}/{job.total_rows} satır · {job.pages} sayfa")
+        if st.button("✖️ İptal", key="cancel_pdf_job", disabled=job.cancel_requested):
+            job.cancel()
+        if job.cancel_requested:
+            st.caption("İptal ediliyor...")
+
+def select_catalog_item():
+    """Katalogdan seçilen ürünü forma aktar"""
+    item = st.session_state.catalog_choice
+    if item is not None:
+        st.session_state.quick_product = item
+        st.session_state.catalog_choice = None
+
+# Bu çalışmanın aşama süreleri (kenar çubuğundaki hata ayıklama bölümü için)
+start_timings()
+run_started = time.perf_counter()
+run_spans, run_timings_token = timings.push()
+
+# st.rerun(), durdurma ya da hata ile biten çalışmalar da toplayıcıyı kapatır
+try:
+    # Sayfa ayarları
+    st.set_page_config(
+        page_title="Buldumlar Biber & Baharat - Fiyat Teklifi",
+        page_icon="🌶️",
+        layout="wide"
+    )
+
+    # CSS stil
+    st.markdown("""
 <style>
     .main-header {
         background-color: #2c1810;
@@ -79,373 +214,331 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Başlık
-st.markdown('<div class="main-header"><h1>🌶️ FİYAT TEKLİFİ OLUŞTURUCU</h1><p>Buldumlar Biber & Baharat Entegre Tesisleri</p></div>', unsafe_allow_html=True)
+    # Başlık
+    st.markdown('<div class="main-header"><h1>🌶️ FİYAT TEKLİFİ OLUŞTURUCU</h1><p>Buldumlar Biber & Baharat Entegre Tesisleri</p></div>', unsafe_allow_html=True)
 
-# Session state başlatma
-if 'products' not in st.session_state:
-    st.session_state.products = []
-if 'editing_index' not in st.session_state:
-    st.session_state.editing_index = None
-if 'pdf_data' not in st.session_state:
-    st.session_state.pdf_data = None
-if 'quick_product' not in st.session_state:
-    st.session_state.quick_product = ""
+    # Session state başlatma
+    if 'products' not in st.session_state:
+        st.session_state.products = ProductStore()
+    if 'editor_version' not in st.session_state:
+        st.session_state.editor_version = 0
+    if 'pdf_data' not in st.session_state:
+        st.session_state.pdf_data = None
+    if 'pdf_job' not in st.session_state:
+        st.session_state.pdf_job = None
+    if 'quick_product' not in st.session_state:
+        st.session_state.quick_product = None
 
-# Sidebar
-with st.sidebar:
-    st.header("📋 İşlemler")
-    if st.button("🗑️ Tüm Ürünleri Temizle"):
+    # Sidebar
+    with st.sidebar:
+        st.header("📋 İşlemler")
+        if st.button("🗑️ Tüm Ürünleri Temizle"):
+            if st.session_state.products:
+                st.session_state.products.clear()
+                st.session_state.editor_version += 1
+                st.success("Tüm ürünler silindi!")
+            else:
+                st.info("Zaten hiç ürün yok!")
+    
+        # Toplu teklif - aynı ürün listesi birçok müşteriye
+        st.divider()
+        st.subheader("📚 Toplu Teklif")
+        customers_file = st.file_uploader("Müşteri Listesi (CSV: company, contact)", type=["csv"])
+        if customers_file is not None:
+            # Toplu üretim (süreç havuzu ve PDF yığını) yalnızca kullanılınca yüklenir
+            from batch_quotes import read_customers_csv, build_quotes_zip
+            customers = read_customers_csv(io.StringIO(customers_file.getvalue().decode("utf-8-sig")))
+            st.caption(f"{len(customers)} müşteri bulundu")
+            if not st.session_state.products:
+                st.info("Toplu teklif için önce ürün ekleyin.")
+            elif customers and st.button("📦 Toplu PDF Oluştur"):
+                with st.spinner("Teklifler oluşturuluyor..."):
+                    st.session_state.batch_zip = build_quotes_zip(customers, st.session_state.products,
+                                                                  history=load_history())
+            if st.session_state.get('batch_zip'):
+                st.download_button(
+                    label="📥 ZIP İndir",
+                    data=st.session_state.batch_zip,
+                    file_name=f"teklifler_{datetime.now().strftime('%Y%m%d_%H%M')}.zip",
+                    mime="application/zip",
+                )
+
+        # Fiyat listesi - tedarikçi listelerini parça parça içe aktar, listeyi dışa aktar
+        st.divider()
+        st.subheader("📑 Fiyat Listesi")
+        price_file = st.file_uploader("Fiyat Listesi (CSV / Excel)", type=["csv", "xlsx"])
+        if price_file is not None:
+            target = st.radio("Aktarım hedefi", ["Teklif listesi", "Katalog"], horizontal=True)
+            if st.button("📥 İçe Aktar"):
+                with st.spinner("Fiyat listesi okunuyor..."):
+                    try:
+                        if target == "Katalog":
+                            catalog = load_catalog()
+                            summary = import_price_list(
+                                price_file, price_file.name,
+                                lambda chunk: catalog.upsert_many(chunk.to_dict('records'), reload=False),
+                            )
+                            catalog.reload()
+                        else:
+                            summary = import_price_list(price_file, price_file.name,
+                                                        st.session_state.products.extend)
+                            st.session_state.editor_version += 1
+                    except ValueError as exc:
+                        summary = None
+                        st.error(str(exc))
+                if summary:
+                    st.success(f"{summary['imported']} / {summary['rows']} satır aktarıldı")
+                    for reason, count in summary['error_counts'].items():
+                        st.caption(f"⚠️ {reason}: {count} satır")
+                    if len(summary['errors']):
+                        st.dataframe(summary['errors'], hide_index=True)
         if st.session_state.products:
-            st.session_state.products.clear()
-            st.session_state.editing_index = None
-            st.success("Tüm ürünler silindi!")
-        else:
-            st.info("Zaten hiç ürün yok!")
+            export_csv, export_xlsx = st.columns(2)
+            export_csv.download_button(
+                label="📤 CSV",
+                data=export_price_list(st.session_state.products, 'csv'),
+                file_name="fiyat_listesi.csv",
+                mime="text/csv",
+            )
+            export_xlsx.download_button(
+                label="📤 Excel",
+                data=export_price_list(st.session_state.products, 'xlsx'),
+                file_name="fiyat_listesi.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
 
-# Ana içerik
-col1, col2 = st.columns([1, 1])
+        # Döviz ve miktar kademeleri - PDF tablosu para birimi x kademe sütunlarıyla çizilir
+        st.divider()
+        st.subheader("💱 Para Birimi ve Kademeler")
+        quote_pricing = None
+        if st.checkbox("Döviz / kademeli fiyat teklifi", key="pricing_enabled"):
+            rates_file = st.file_uploader("Kur Tablosu (CSV: date, currency, rate)", type=["csv"],
+                                          help="rate: 1 birimin TL karşılığı; teklif günü ya da öncesindeki en yakın kur kullanılır")
+            if rates_file is not None and st.button("💾 Kurları Kaydet"):
+                try:
+                    pricing.save_rates(rates_file.getvalue())
+                    st.success("Kur tablosu kaydedildi")
+                except Exception as exc:
+                    st.error(f"Kur tablosu okunamadı: {exc}")
+            currencies = pricing.available_currencies()
+            selected_currencies = st.multiselect(
+                "Para Birimleri", currencies,
+                default=[c for c in ('TRY', 'EUR', 'USD') if c in currencies],
+                format_func=lambda c: pricing.CURRENCY_NAMES.get(c, c),
+                key="pricing_currencies",
+            )
+            tiers = st.data_editor(
+                pd.DataFrame(pricing.DEFAULT_TIERS, columns=['En Az (kg)', 'İndirim %']),
+                key="pricing_tiers",
+                num_rows="dynamic",
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    'En Az (kg)': st.column_config.NumberColumn(min_value=0.0, step=1.0, required=True),
+                    'İndirim %': st.column_config.NumberColumn(min_value=0.0, max_value=99.0, step=0.5, required=True),
+                },
+            ).dropna()
+            try:
+                quote_pricing = pricing.Pricing.for_day(datetime.now(), selected_currencies,
+                                                        tiers.itertuples(index=False, name=None))
+            except ValueError as exc:
+                st.error(str(exc))
+            else:
+                if quote_pricing.rates_date:
+                    st.caption(f"Kur tarihi: {quote_pricing.rates_date:%d.%m.%Y} · " + ", ".join(
+                        f"1 {c} = {quote_pricing.rates[c]:.4f} TL" for c in quote_pricing.currencies if c != 'TRY'))
 
-with col1:
-    st.subheader("👥 Müşteri Bilgileri")
-    customer_company = st.text_input("Müşteri Firma Adı", placeholder="Örnek: Saloon Burger")
-    contact_person = st.text_input("İlgili Kişi", placeholder="Örnek: Mehmet Yılmaz")
-    
-    st.subheader("🛒 Ürün Ekle/Düzenle")
-    
-    # HIZLI ÜRÜN BUTONLARI
-    st.write("**⚡ Hızlı Ürün Seçimi:**")
-    
-    # İlk sıra - Biber ürünleri
-    col_p1, col_p2, col_p3 = st.columns(3)
-    
-    with col_p1:
-        if st.button("🌶️ Yağlı Pul Biber", use_container_width=True, key="yagli_pul"):
-            st.session_state.quick_product = "Yağlı Pul Biber"
-            st.rerun()
-    
-    with col_p2:
-        if st.button("🌶️ İpek Pul Biber", use_container_width=True, key="ipek_pul"):
-            st.session_state.quick_product = "İpek Pul Biber"
-            st.rerun()
-    
-    with col_p3:
-        if st.button("🌶️ Halis Pul Biber", use_container_width=True, key="halis_pul"):
-            st.session_state.quick_product = "Halis Pul Biber"
-            st.rerun()
-    
-    # İkinci sıra - Diğer ürünler
-    col_p4, col_p5, col_p6 = st.columns(3)
+    # Ana içerik
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.subheader("👥 Müşteri Bilgileri")
+        customer_company = st.text_input("Müşteri Firma Adı", placeholder="Örnek: Saloon Burger")
+        contact_person = st.text_input("İlgili Kişi", placeholder="Örnek: Mehmet Yılmaz")
     
-    with col_p4:
-        if st.button("🌿 İsot", use_container_width=True, key="isot"):
-            st.session_state.quick_product = "İsot"
-            st.rerun()
+        st.subheader("🛒 Ürün Ekle")
     
-    with col_p5:
-        if st.button("🌿 Kekik", use_container_width=True, key="kekik"):
-            st.session_state.quick_product = "Kekik"
-            st.rerun()
+        # HIZLI ÜRÜN SEÇİMİ - katalogda ara, seçilen ürünün adı, fiyatı ve KDV'si forma gelir
+        st.write("**⚡ Hızlı Ürün Seçimi:**")
+        catalog = load_catalog()
     
-    with col_p6:
-        if st.button("🌿 Köri", use_container_width=True, key="kori"):
-            st.session_state.quick_product = "Köri"
-            st.rerun()
+        col_search, col_result = st.columns([1, 1])
+        with col_search:
+            catalog_query = st.text_input("Katalogda Ara", placeholder="Örnek: isot, pul biber", key="catalog_query")
+        with col_result:
+            st.selectbox(
+                "Ürün Seç",
+                catalog.search(catalog_query),
+                index=None,
+                format_func=format_catalog_item,
+                placeholder=f"{len(catalog)} ürün arasından seçin",
+                key="catalog_choice",
+                on_change=select_catalog_item,
+            )
     
-    st.divider()
+        st.divider()
     
-    # Form alanları
-    # Düzenleme kontrolü
-    if st.session_state.editing_index is not None:
-        editing_product = st.session_state.products[st.session_state.editing_index]
-        default_name = editing_product['name']
-        default_price = editing_product['unit_price']
-        default_vat = editing_product['vat_rate']
-        button_text = "✏️ Ürünü Güncelle"
-        button_color = "secondary"
-    else:
+        # Form alanları
         # Hızlı ürün seçimi kontrolü
         if st.session_state.quick_product:
-            default_name = st.session_state.quick_product
-            st.session_state.quick_product = ""  # Temizle
+            quick = st.session_state.quick_product
+            default_name = quick['name']
+            default_price = float(quick['unit_price'])
+            default_vat = float(quick['vat_rate'])
+            default_category = quick.get('category', '')
+            st.session_state.quick_product = None  # Temizle
         else:
             default_name = ""
-        default_price = 0.0
-        default_vat = 1.0  # KDV varsayılan %1
-        button_text = "➕ Ürün Ekle"
-        button_color = "primary"
+            default_price = 0.0
+            default_vat = 1.0  # KDV varsayılan %1
+            default_category = ""
+    
+        product_name = st.text_input("Ürün Adı", value=default_name, placeholder="Örnek: Karabiber")
     
-    product_name = st.text_input("Ürün Adı", value=default_name, placeholder="Örnek: Karabiber")
+        col_price, col_vat = st.columns([2, 1])
+        with col_price:
+            unit_price = st.number_input("Kilogram Fiyatı (KDV Hariç)", value=default_price, min_value=0.0, step=0.01)
+        with col_vat:
+            vat_rate = st.number_input("KDV (%)", value=default_vat, min_value=0.0, max_value=100.0, step=1.0)
     
-    col_price, col_vat = st.columns([2, 1])
-    with col_price:
-        unit_price = st.number_input("Kilogram Fiyatı (KDV Hariç)", value=default_price, min_value=0.0, step=0.01)
-    with col_vat:
-        vat_rate = st.number_input("KDV (%)", value=default_vat, min_value=0.0, max_value=100.0, step=1.0)
+        product_category = st.text_input("Kategori", value=default_category, placeholder="Örnek: Baharat",
+                                         help="Uzun tekliflerde ürünler kategoriye göre gruplanır")
     
-    # Butonlar
-    col_btn1, col_btn2 = st.columns([1, 1])
+        save_to_catalog = st.checkbox("Kataloğa kaydet", help="Ürün adı, fiyatı, KDV oranı ve kategorisi katalogda saklanır")
     
-    with col_btn1:
-        if st.button(button_text, type=button_color):
+        # Buton
+        if st.button("➕ Ürün Ekle", type="primary"):
             if product_name.strip():
-                vat_price = unit_price * (1 + vat_rate / 100)
-                
-                product = {
-                    'name': product_name.strip(),
-                    'unit_price': unit_price,
-                    'vat_rate': vat_rate,
-                    'vat_price': vat_price
-                }
-                
-                if st.session_state.editing_index is not None:
-                    st.session_state.products[st.session_state.editing_index] = product
-                    st.session_state.editing_index = None
-                    st.success(f"'{product_name}' güncellendi!")
-                    st.rerun()
-                else:
-                    st.session_state.products.append(product)
-                    st.rerun()
+                name = product_name.strip()
+                if save_to_catalog:
+                    catalog.upsert(name, unit_price, vat_rate, product_category.strip())
+            
+                st.session_state.products.append(name, unit_price, vat_rate, category=product_category.strip())
+                st.session_state.editor_version += 1
+                st.rerun()
             else:
                 st.error("Ürün adı boş olamaz!")
-    
-    with col_btn2:
-        if st.session_state.editing_index is not None:
-            if st.button("❌ İptal"):
-                st.session_state.editing_index = None
-                st.rerun()
 
-with col2:
-    st.subheader("📦 Eklenen Ürünler")
+    with col2:
+        st.subheader("📦 Eklenen Ürünler")
     
-    if st.session_state.products:
-        # DataFrame gösterimi
-        df_data = []
-        for i, product in enumerate(st.session_state.products):
-            df_data.append({
-                'No': i + 1,
-                'Ürün Adı': product['name'],
-                'KDV Hariç (TL/kg)': f"{product['unit_price']:.2f}",
-                'KDV %': f"{product['vat_rate']:.0f}",
-                'KDV Dahil (TL/kg)': f"{product['vat_price']:.2f}"
-            })
+        if st.session_state.products:
+            # Tek düzenlenebilir tablo: hücreyi düzenle, satır seçip sil, "Sıra" ile yeniden sırala
+            # Tüm fiyat hesapları ürün deposunda tek geçişte yapılır
+            products = st.session_state.products
+            st.data_editor(
+                products.editor_frame(),
+                key=f"products_editor_{st.session_state.editor_version}",
+                on_change=apply_product_edits,
+                num_rows="dynamic",
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    'Sıra': st.column_config.NumberColumn(min_value=1, step=1),
+                    'Ürün Adı': st.column_config.TextColumn(required=True),
+                    'Kategori': st.column_config.TextColumn(),
+                    'KDV Hariç (TL/kg)': st.column_config.NumberColumn(min_value=0.0, step=0.01, format="%.2f"),
+                    'KDV %': st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=1.0, format="%.0f"),
+                    'Miktar (kg)': st.column_config.NumberColumn(min_value=0.0, step=0.5, help="İsteğe bağlı; girilirse tutar ve toplamlar hesaplanır"),
+                    'KDV Dahil (TL/kg)': st.column_config.NumberColumn(format="%.2f", disabled=True),
+                    'Tutar (KDV Dahil)': st.column_config.NumberColumn(format="%.2f", disabled=True),
+                },
+            )
         
-        df = pd.DataFrame(df_data)
-        st.dataframe(df, use_container_width=True, hide_index=True)
+            # Miktar girilmişse KDV dökümü ve genel toplam
+            if products.has_quantities:
+                totals = products.totals()
+                col_net, col_vat, col_total = st.columns(3)
+                col_net.metric("Ara Toplam (KDV Hariç)", f"{totals['net_total']:.2f} TL")
+                col_vat.metric("Toplam KDV", f"{totals['vat_amount']:.2f} TL")
+                col_total.metric("Genel Toplam", f"{totals['line_total']:.2f} TL")
+                breakdown = products.vat_breakdown().rename(columns={
+                    'vat_rate': 'KDV %', 'net_total': 'Matrah (TL)',
+                    'vat_amount': 'KDV (TL)', 'line_total': 'Toplam (TL)',
+                })
+                st.dataframe(breakdown, hide_index=True, use_container_width=True)
         
-        # İşlem butonları
-        st.write("**İşlemler:**")
-        for i, product in enumerate(st.session_state.products):
-            col_edit, col_delete, col_info = st.columns([1, 1, 3])
-            
-            with col_edit:
-                if st.button(f"✏️", key=f"edit_{i}", help="Düzenle"):
-                    st.session_state.editing_index = i
-                    st.rerun()
-            
-            with col_delete:
-                if st.button(f"🗑️", key=f"delete_{i}", help="Sil"):
-                    deleted_name = st.session_state.products[i]['name']
-                    st.session_state.products.pop(i)
-                    if st.session_state.editing_index == i:
-                        st.session_state.editing_index = None
-                    elif st.session_state.editing_index is not None and st.session_state.editing_index > i:
-                        st.session_state.editing_index -= 1
-                    st.success(f"'{deleted_name}' silindi!")
-                    st.rerun()
-            
-            with col_info:
-                st.write(f"{i+1}. {product['name']}")
+            # Para birimi x kademe fiyatları (PDF tablosunun aynısı)
+            if quote_pricing is not None:
+                started = time.perf_counter()
+                matrix = quote_pricing.matrix_frame(products)
+                matrix_seconds = time.perf_counter() - started
+                timings.record('ui.pricing_matrix', matrix_seconds, rows=len(products))
+                st.dataframe(matrix, hide_index=True, use_container_width=True,
+                             column_config={column: st.column_config.NumberColumn(format="%.2f")
+                                            for column in matrix.columns[1:]})
+                st.caption(f"{len(products)} ürün x {len(quote_pricing.currencies)} para birimi x "
+                           f"{len(quote_pricing.tiers)} kademe · {matrix_seconds * 1000:.1f} ms")
         
-        st.write(f"**Toplam: {len(st.session_state.products)} ürün**")
-    else:
-        st.info("Henüz ürün eklenmemiş. Soldan ürün bilgilerini doldurup 'Ürün Ekle' butonuna tıklayın.")
-
-# PDF Oluşturma Bölümü
-st.divider()
-st.subheader("📄 PDF Oluştur")
-
-if st.session_state.products and customer_company.strip():
-    if st.button("📋 PDF TEKLİFİ OLUŞTUR", type="primary", use_container_width=True):
-        try:
-            # Logo watermark fonksiyonu
-            def create_watermark_logo():
-                logo_files = ['logo.png', 'logo.jpg', 'logo.jpeg', 'Logo.png', 'LOGO.png']
-                for logo_file in logo_files:
-                    if os.path.exists(logo_file):
-                        try:
-                            with PILImage.open(logo_file) as img:
-                                if img.mode != 'RGBA':
-                                    img = img.convert('RGBA')
-                                
-                                img.thumbnail((350, 350), PILImage.Resampling.LANCZOS)
-                                canvas = PILImage.new('RGBA', (400, 400), (0, 0, 0, 0))
-                                x = (400 - img.size[0]) // 2
-                                y = (400 - img.size[1]) // 2
-                                canvas.paste(img, (x, y), img)
-                                
-                                # Şeffaflık
-                                pixels = canvas.load()
-                                for i in range(canvas.size[0]):
-                                    for j in range(canvas.size[1]):
-                                        r, g, b, a = pixels[i, j]
-                                        pixels[i, j] = (r, g, b, int(a * 0.25))
-                                
-                                temp_path = "temp_watermark.png"
-                                canvas.save(temp_path, 'PNG')
-                                return temp_path
-                        except:
-                            continue
-                return None
-            
-            # PDF oluştur
-            filename = f"fiyat_teklifi_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-            doc = SimpleDocTemplate(filename, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
-            story = []
-            
-            # Stiller
-            company_style = ParagraphStyle('CompanyStyle', fontName=FONT_BOLD, fontSize=16,
-                                          spaceAfter=25, alignment=TA_CENTER,
-                                          textColor=colors.Color(0.86, 0.24, 0.26))
-            
-            title_style = ParagraphStyle('TitleStyle', fontName=FONT_BOLD, fontSize=18,
-                                        spaceAfter=20, alignment=TA_CENTER,
-                                        textColor=colors.Color(0.86, 0.24, 0.26))
-            
-            left_style = ParagraphStyle('LeftStyle', fontName=FONT_NORMAL, fontSize=10,
-                                       spaceAfter=4, alignment=TA_LEFT, leftIndent=0)
-            
-            heading_style = ParagraphStyle('HeadingStyle', fontName=FONT_BOLD, fontSize=12,
-                                          spaceAfter=8, textColor=colors.Color(0.86, 0.24, 0.26))
-            
-            normal_style = ParagraphStyle('NormalStyle', fontName=FONT_NORMAL, fontSize=10, spaceAfter=6)
-            
-            contact_style = ParagraphStyle('ContactStyle', fontName=FONT_BOLD, fontSize=11,
-                                         spaceAfter=8, alignment=TA_LEFT,
-                                         textColor=colors.Color(0.86, 0.24, 0.26))
-            
-            # İçerik oluştur - Gerçek Türkçe karakterlerle
-            company_name = "BULDUMLAR BİBER & BAHARAT ENT. TESİSLERİ"
-            story.append(Paragraph(company_name, company_style))
-            story.append(Paragraph("FİYAT TEKLİFİ", title_style))
-            story.append(Spacer(1, 15))
-            
-            today = datetime.now()
-            story.append(Paragraph(f"<b>Tarih:</b> {today.strftime('%d/%m/%Y')}", left_style))
-            story.append(Paragraph(f"<b>Teklif No:</b> BLD-{today.strftime('%Y%m%d')}-{today.strftime('%H%M')}", left_style))
-            story.append(Spacer(1, 20))
-            
-            story.append(Paragraph("SAYIN", heading_style))
-            customer_info = customer_company
-            if contact_person.strip():
-                customer_info += f"<br/>Att: {contact_person}"
-            story.append(Paragraph(customer_info, normal_style))
-            story.append(Spacer(1, 20))
-            
-            story.append(Paragraph("FİYAT LİSTESİ (Kilogram Bazında)", heading_style))
-            story.append(Spacer(1, 10))
-            
-            # Tablo - Türkçe karakterlerle
-            table_headers = ['Ürün Adı', 'Birim Fiyat\n(KDV Hariç)', 'KDV %', 'Birim Fiyat\n(KDV Dahil)']
-            table_data = [table_headers]
-            
-            for product in st.session_state.products:
-                table_data.append([
-                    product['name'],
-                    f"{product['unit_price']:.2f} TL/kg",
-                    f"%{product['vat_rate']:.0f}",
-                    f"{product['vat_price']:.2f} TL/kg"
-                ])
-            
-            product_table = Table(table_data, colWidths=[6*cm, 3.5*cm, 2*cm, 3.5*cm])
-            product_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.86, 0.24, 0.26)),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
-                ('FONTNAME', (0, 1), (-1, -1), FONT_NORMAL),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.Color(1, 0.95, 0.95), colors.white]),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('LEFTPADDING', (0, 0), (-1, -1), 8),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ]))
-            
-            story.append(product_table)
-            story.append(Spacer(1, 25))
-            
-            # Notlar - Gerçek Türkçe karakterlerle
-            notes = """<b>NOTLAR:</b><br/>
-            • Fiyatlar Türk Lirası cinsindendir.<br/>
-            • Fiyatlar kilogram bazında verilmiştir.<br/>
-            • Minimum sipariş miktarları için ayrıca bilgi verilecektir.<br/>
-            • Teslim süresi sipariş onayından sonra belirlenecektir."""
-            
-            story.append(Paragraph(notes, normal_style))
-            story.append(Spacer(1, 30))
-            
-            # İLETİŞİM BİLGİLERİ - Gerçek Türkçe karakterlerle
-            story.append(Paragraph("TEKLİF VEREN:", contact_style))
-            story.append(Paragraph("<b>Ertuğrul BULDUM</b>", normal_style))
-            story.append(Paragraph("Satış Direktörü", normal_style))
-            story.append(Spacer(1, 10))
-            story.append(Paragraph("<b>İletişim:</b> +90 530 078 06 46", normal_style))
-            story.append(Paragraph("E-mail: info@buldumlarbiber.com", normal_style))
-            
-            # Logo ekleme fonksiyonu
-            def add_logo_watermark(canvas, doc):
-                temp_logo = create_watermark_logo()
-                if temp_logo and os.path.exists(temp_logo):
-                    try:
-                        page_width, page_height = A4
-                        logo_size = 400
-                        x = (page_width - logo_size) / 2
-                        y = (page_height - logo_size) / 2
-                        canvas.drawImage(temp_logo, x, y, width=logo_size, height=logo_size, 
-                                       mask='auto', preserveAspectRatio=True)
-                        os.remove(temp_logo)
-                    except:
-                        pass
-            
-            # PDF'i oluştur
-            doc.build(story, onFirstPage=add_logo_watermark, onLaterPages=add_logo_watermark)
-            
-            # PDF'i session state'e kaydet
-            with open(filename, "rb") as pdf_file:
-                st.session_state.pdf_data = pdf_file.read()
-                st.session_state.pdf_filename = filename
-            
-            st.success("PDF başarıyla oluşturuldu!")
-            
-            # Temizlik
-            if os.path.exists(filename):
-                os.remove(filename)
-                
-        except Exception as e:
-            st.error(f"PDF oluşturma hatası: {str(e)}")
-
-# PDF kontrolleri
-if st.session_state.pdf_data:
-    st.subheader("📄 PDF Kontrolleri")
+            st.write(f"**Toplam: {len(st.session_state.products)} ürün**")
+        else:
+            st.info("Henüz ürün eklenmemiş. Soldan ürün bilgilerini doldurup 'Ürün Ekle' butonuna tıklayın.")
+
+    # PDF Oluşturma Bölümü
+    st.divider()
+    st.subheader("📄 PDF Oluştur")
+
+    if st.session_state.products and customer_company.strip():
+        if st.button("📋 PDF TEKLİFİ OLUŞTUR", type="primary", use_container_width=True,
+                     disabled=st.session_state.pdf_job is not None):
+            # PDF arka planda oluşturulur; font ve filigran ilk oluşturmada yüklenir, sonra paylaşılır
+            # Aynı girdilerle (aynı gün) daha önce oluşturulduysa aynı teklif numarası
+            # ve önbellekteki PDF kullanılır; yoksa arşivden yeni numara alınır
+            # Profil istenmişse önbellek atlanır, böylece gerçek çizim ölçülür
+            profile = st.session_state.get('profile_next', False)
+            engine = load_pdf_engine()
+            # Çizim sürerken tabloda yapılan düzenlemeler bu teklifi etkilemesin
+            products = ProductStore(st.session_state.products.frame)
+            customer, contact, selected_pricing = customer_company, contact_person, quote_pricing
+            history, cache = load_history(), None if profile else load_quote_cache()
+        
+            def generate(progress):
+                return issue_quote(customer, contact, products, datetime.now(), history=history, cache=cache,
+                                   render=partial(engine.build_quote_pdf, progress=progress), pricing=selected_pricing)
+        
+            st.session_state.pdf_job = load_pdf_jobs().submit(generate, total_rows=len(products), profile=profile)
+            st.session_state.pdf_message = None
+            if profile:
+                st.session_state.profile_next = False
+
+    # Arka plandaki PDF işi: ilerleme ve iptal (parça kendi kendine yenilenir)
+    if st.session_state.pdf_job:
+        show_pdf_job()
+    if st.session_state.get('pdf_message'):
+        kind, message = st.session_state.pdf_message
+        getattr(st, kind)(message)
+        st.session_state.pdf_message = None
+
+    # PDF kontrolleri
+    if st.session_state.pdf_data:
+        st.subheader("📄 PDF Kontrolleri")
+        font_error = load_pdf_engine().font_error()
+        if font_error:
+            st.warning(f"Türkçe font yüklenemedi: {font_error}. PDF standart fontla oluşturuldu; "
+                       "Türkçe karakterler hatalı görünebilir.")
     
-    col_download, col_print, col_share = st.columns([1, 1, 1])
+        # Yazdırma ve önizleme aynı sunucu adresini kullanır; tarayıcıya PDF baytı gönderilmez
+        pdf_url = register_pdf_url(st.session_state.pdf_data)
     
-    with col_download:
-        st.download_button(
-            label="📥 PDF İndir",
-            data=st.session_state.pdf_data,
-            file_name=st.session_state.pdf_filename,
-            mime="application/pdf",
-            use_container_width=True
-        )
+        col_download, col_print, col_share = st.columns([1, 1, 1])
+    
+        with col_download:
+            st.download_button(
+                label="📥 PDF İndir",
+                data=st.session_state.pdf_data,
+                file_name=st.session_state.pdf_filename,
+                mime="application/pdf",
+                use_container_width=True
+            )
+            # Boyut ve nesne türüne göre dağılım (font, görüntü, sayfa içeriği)
+            from pdf_output import size_breakdown
+            pdf_sizes = size_breakdown(st.session_state.pdf_data)
+            st.caption(f"{len(st.session_state.pdf_data) / 1024:.1f} KB · " + " · ".join(
+                f"{kind} {size / 1024:.1f} KB" for kind, size in pdf_sizes.items()))
     
-    with col_print:
-        # Yazdırma butonu
-        print_button_html = f"""
+        with col_print:
+            # Yazdırma butonu
+            print_button_html = f"""
         <button onclick="printPDF()" style="
             background-color: #28a745; 
             color: white; 
@@ -459,23 +552,20 @@ if st.session_state.pdf_data:
         
         <script>
         function printPDF() {{
-            const pdfData = {list(st.session_state.pdf_data)};
-            const pdfBlob = new Blob([new Uint8Array(pdfData)], {{type: 'application/pdf'}});
-            const pdfUrl = URL.createObjectURL(pdfBlob);
-            const printWindow = window.open(pdfUrl);
+            const printWindow = window.open({json.dumps(pdf_url)});
             printWindow.onload = function() {{
                 printWindow.print();
             }};
         }}
         </script>
         """
-        st.components.v1.html(print_button_html, height=50)
+            st.components.v1.html(print_button_html, height=50)
     
-    with col_share:
-        share_text = f"Fiyat Teklifi: {customer_company} - {len(st.session_state.products)} ürün"
-        share_url = f"https://wa.me/?text={share_text.replace(' ', '%20')}"
+        with col_share:
+            share_text = f"Fiyat Teklifi: {customer_company} - {len(st.session_state.products)} ürün"
+            share_url = f"https://wa.me/?text={share_text.replace(' ', '%20')}"
         
-        st.markdown(f"""
+            st.markdown(f"""
         <a href="{share_url}" target="_blank" style="
             display: inline-block; 
             background-color: #25d366; 
@@ -490,13 +580,114 @@ if st.session_state.pdf_data:
         ">📱 WhatsApp Paylaş</a>
         """, unsafe_allow_html=True)
     
-    # PDF Görüntüleme
-    if st.button("👁️ PDF Görüntüle", use_container_width=True):
-        b64_pdf = base64.b64encode(st.session_state.pdf_data).decode('utf-8')
-        pdf_display = f'<iframe src="data:application/pdf;base64,{b64_pdf}" width="100%" height="600"></iframe>'
-        st.markdown(pdf_display, unsafe_allow_html=True)
-
-elif not st.session_state.products:
-    st.warning("PDF oluşturmak için en az bir ürün ekleyin.")
-elif not customer_company.strip():
-    st.warning("PDF oluşturmak için müşteri firma adını girin.")
+        # PDF Görüntüleme
+        if st.button("👁️ PDF Görüntüle", use_container_width=True):
+            pdf_display = f'<iframe src="{html.escape(pdf_url)}" width="100%" height="600"></iframe>'
+            st.markdown(pdf_display, unsafe_allow_html=True)
+
+    elif not st.session_state.products:
+        st.warning("PDF oluşturmak için en az bir ürün ekleyin.")
+    elif not customer_company.strip():
+        st.warning("PDF oluşturmak için müşteri firma adını girin.")
+
+    # Teklif geçmişi (bu çalışmada oluşturulan teklif de görünsün diye en sonda)
+    HISTORY_PAGE_SIZE = 10
+
+    with st.sidebar:
+        st.divider()
+        st.subheader("🗂️ Teklif Geçmişi")
+        history_customer = st.text_input("Müşteri", key="history_customer", placeholder="Örnek: Saloon Burger",
+                                         on_change=reset_history_page)
+        history_product = st.text_input("Ürün", key="history_product", placeholder="Örnek: İsot",
+                                        on_change=reset_history_page)
+        history_dates = st.date_input("Tarih Aralığı", value=(), key="history_dates", on_change=reset_history_page)
+        date_from = history_dates[0] if len(history_dates) > 0 else None
+        date_to = history_dates[1] + timedelta(days=1) if len(history_dates) > 1 else None
+    
+        if 'history_page' not in st.session_state:
+            st.session_state.history_page = 0
+        quotes, quote_total = load_history().search(
+            customer=history_customer, product=history_product, date_from=date_from, date_to=date_to,
+            limit=HISTORY_PAGE_SIZE, offset=st.session_state.history_page * HISTORY_PAGE_SIZE,
+        )
+        page_count = max(1, -(-quote_total // HISTORY_PAGE_SIZE))
+    
+        if quotes:
+            st.dataframe(
+                pd.DataFrame(quotes)[['quote_no', 'created_at', 'customer', 'product_count']].rename(columns={
+                    'quote_no': 'Teklif No', 'created_at': 'Tarih', 'customer': 'Müşteri', 'product_count': 'Ürün',
+                }),
+                hide_index=True,
+                use_container_width=True,
+            )
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("◀", key="history_prev", disabled=st.session_state.history_page == 0):
+                    st.session_state.history_page -= 1
+                    st.rerun()
+            with col_page:
+                st.caption(f"Sayfa {st.session_state.history_page + 1}/{page_count} · {quote_total} teklif")
+            with col_next:
+                if st.button("▶", key="history_next", disabled=st.session_state.history_page + 1 >= page_count):
+                    st.session_state.history_page += 1
+                    st.rerun()
+        
+            # Arşivdeki teklifi yeniden aç: önbellekte varsa anında gelir, yoksa aynı numarayla yeniden oluşturulur
+            selected = st.selectbox("Teklif", quotes, format_func=lambda q: f"{q['quote_no']} · {q['customer']}",
+                                    key="history_choice")
+            if st.button("📂 Teklifi Aç", key="history_open"):
+                quote = load_history().get(selected['id'])
+                created_at = datetime.strptime(quote['created_at'], '%Y-%m-%d %H:%M:%S')
+                cache_key = quote['cache_key'] or quote_key(quote['customer'], quote['contact'], quote['products'],
+                                                            created_at, quote['pricing'])
+                st.session_state.pdf_data = load_quote_cache().get_or_build(
+                    cache_key,
+                    lambda: load_pdf_engine().build_quote_pdf(quote['customer'], quote['contact'], quote['products'],
+                                                              created_at, quote_no=quote['quote_no'],
+                                                              pricing=quote['pricing']),
+                )
+                st.session_state.pdf_filename = f"fiyat_teklifi_{quote['quote_no']}.pdf"
+                st.rerun()
+        else:
+            st.caption("Kayıtlı teklif bulunamadı.")
+
+    # Önbellek istatistikleri (bu çalışmadaki oluşturma dahil olsun diye en sonda)
+    with st.sidebar:
+        st.divider()
+        st.subheader("🗄️ PDF Önbelleği")
+        cache_stats = load_quote_cache().stats
+        col_hit, col_miss = st.columns(2)
+        col_hit.metric("İsabet", cache_stats['memory_hits'] + cache_stats['disk_hits'])
+        col_miss.metric("Iskalama", cache_stats['misses'])
+        disk_files, disk_bytes = load_quote_cache().disk_usage()
+        st.caption(f"Bellek: {cache_stats['memory_hits']} · Disk: {cache_stats['disk_hits']} · "
+                   f"Diskte {disk_files} PDF ({disk_bytes / 1024:.0f} KB)")
+finally:
+    # Aşama süreleri (bu çalışmanın tamamı ölçülsün diye en sonda)
+    timings.record('ui.rerun', time.perf_counter() - run_started)
+    timings.pop(run_timings_token)
+
+# Profil ve hata ayıklama süreleri
+with st.sidebar:
+    st.divider()
+    st.subheader("⏱️ Süreler")
+    st.checkbox("🔬 Sonraki PDF'i profille (cProfile)", key="profile_next")
+    profile_result = st.session_state.get('profile_result')
+    if profile_result:
+        st.download_button(
+            label="📥 Profil (.prof)",
+            data=profile_result['prof'],
+            file_name=f"teklif_profil_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof",
+            mime="application/octet-stream",
+        )
+        with st.expander("Profil özeti"):
+            st.code(profile_result['summary'], language=None)
+    if st.checkbox("Hata ayıklama sürelerini göster", key="show_timings"):
+        with st.expander("Hata ayıklama süreleri", expanded=True):
+            st.caption("Bu çalışma")
+            st.dataframe(pd.DataFrame(run_spans), hide_index=True)
+            if st.session_state.get('quote_timings'):
+                st.caption("Son PDF oluşturma")
+                st.dataframe(pd.DataFrame(st.session_state.quote_timings), hide_index=True)
+            st.caption("Süreç geneli")
+            st.dataframe(pd.DataFrame(timings.snapshot()).round(2), hide_index=True)
@@ -0,0 +1,124 @@
+"""Türkçe karakter destekli font dosyalarını bulma
+
+Sıralama: yapılandırılabilir yerel font klasörü, sistem fontları
+(fontconfig / /usr/share/fonts), en son çare olarak kalıcı önbellek
+klasörüne indirme (SHA-256 doğrulamalı).
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import urllib.request
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Yerel font klasörü (FIYAT_FONT_DIR ile değiştirilebilir)
+FONT_DIR = os.environ.get("FIYAT_FONT_DIR", os.path.join(APP_DIR, "fonts"))
+
+# Kalıcı önbellek klasörü (FIYAT_CACHE_DIR ile değiştirilebilir)
+CACHE_DIR = os.environ.get(
+    "FIYAT_CACHE_DIR",
+    os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "fiyat-uygulamasi"),
+)
+
+SYSTEM_FONT_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+]
+
+FONT_BASE_URL = "https://github.com/dejavu-fonts/dejavu-fonts/raw/master/ttf/"
+
+# Dosya adı -> (fontconfig deseni, DejaVu 2.37 SHA-256 özeti)
+FONT_FILES = {
+    "DejaVuSans.ttf": (
+        "DejaVu Sans:style=Book",
+        "abdc775b21b1bc470d50c97e790d276f2054b7504e56e5bd3e64f48d68582322",
+    ),
+    "DejaVuSans-Bold.ttf": (
+        "DejaVu Sans:style=Bold",
+        "0d977336a6d5fba34eab8e3199eb218327161b5143749f802982c2bc34df0c96",
+    ),
+}
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _find_local(filename):
+    path = os.path.join(FONT_DIR, filename)
+    return path if os.path.isfile(path) else None
+
+
+def _find_fontconfig(filename, pattern):
+    if not shutil.which("fc-match"):
+        return None
+    try:
+        result = subprocess.run(
+            ["fc-match", "-f", "%{file}", pattern],
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    path = result.stdout.strip()
+    # fc-match bulamazsa başka bir font döndürür, dosya adını kontrol et
+    if path and os.path.basename(path) == filename and os.path.isfile(path):
+        return path
+    return None
+
+
+def _find_system(filename):
+    for font_dir in SYSTEM_FONT_DIRS:
+        if not os.path.isdir(font_dir):
+            continue
+        for root, _dirs, files in os.walk(font_dir):
+            if filename in files:
+                return os.path.join(root, filename)
+    return None
+
+
+def _find_cached(filename, checksum):
+    path = os.path.join(CACHE_DIR, "fonts", filename)
+    if os.path.isfile(path) and _sha256(path) == checksum:
+        return path
+    return None
+
+
+def _download(filename, checksum):
+    target_dir = os.path.join(CACHE_DIR, "fonts")
+    os.makedirs(target_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target_dir, suffix=".part")
+    os.close(fd)
+    try:
+        urllib.request.urlretrieve(FONT_BASE_URL + filename, tmp_path)
+        actual = _sha256(tmp_path)
+        if actual != checksum:
+            raise ValueError(f"{filename} özeti uyuşmuyor: {actual}")
+        target = os.path.join(target_dir, filename)
+        os.replace(tmp_path, target)
+        return target
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def resolve_font(filename):
+    """Font dosyasının yolunu döndür, gerekirse önbelleğe indir"""
+    pattern, checksum = FONT_FILES[filename]
+    return (
+        _find_local(filename)
+        or _find_fontconfig(filename, pattern)
+        or _find_system(filename)
+        or _find_cached(filename, checksum)
+        or _download(filename, checksum)
+    )
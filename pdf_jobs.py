@@ -0,0 +1,129 @@
+"""Arka planda PDF oluşturma işleri
+
+Teklif, süreç genelinde paylaşılan bir iş parçacığı havuzuna gönderilir;
+oturumda yalnızca iş kimliği tutulur. Arayüz ilerlemeyi (sayfa, satır)
+okur, işi iptal edebilir ve biten PDF'i sonraki çalışmada alır. Böylece
+uzun teklifler çizilirken betik ve tablo düzenleyici bloklanmaz.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import timings
+
+MAX_WORKERS = 2
+
+# Sonucu alınmayan (sekmesi kapanmış) işler bu süre sonunda silinir (sn)
+JOB_TTL = 15 * 60
+
+
+class JobCancelled(Exception):
+    """İş kullanıcı tarafından iptal edildi"""
+
+
+class PdfJob:
+    """Tek bir PDF işinin durumu ve ilerlemesi"""
+
+    def __init__(self, total_rows=0, profile=False):
+        self.id = uuid.uuid4().hex
+        self.total_rows = total_rows
+        self.profile = profile
+        self.state = 'queued'  # queued, running, done, failed, cancelled
+        self.pages = 0
+        self.rows = 0
+        self.result = None
+        self.error = None
+        self.spans = []
+        self.profile_result = None
+        self.created = time.monotonic()
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self):
+        return self.state in ('done', 'failed', 'cancelled')
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def report(self, event, value):
+        """PDF çiziminden gelen ilerleme; iptal istenmişse çizimi durdurur"""
+        if self._cancel.is_set():
+            raise JobCancelled()
+        if event == 'page':
+            self.pages = value
+        elif event == 'rows':
+            self.rows = value
+
+    def cancel(self):
+        """İptal iste: sıradaki iş hiç başlamaz, çalışan iş sonraki ilerlemede durur"""
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self.state = 'cancelled'
+
+
+class PdfJobs:
+    """İş parçacığı havuzu ve iş kimliği -> iş kaydı"""
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pdf-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, build, total_rows=0, profile=False):
+        """build(progress) işini kuyruğa ekle, iş kimliğini döndür
+
+        progress(olay, değer) quote_pdf.build_quote_pdf'e verilir. profile
+        True ise iş cProfile altında çalışır.
+        """
+        job = PdfJob(total_rows, profile)
+        with self._lock:
+            self._expire()
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, build)
+        return job.id
+
+    @staticmethod
+    def _run(job, build):
+        if job.cancel_requested:
+            job.state = 'cancelled'
+            return
+        job.state = 'running'
+        try:
+            with timings.collect() as spans, \
+                    (timings.profiled() if job.profile else nullcontext({})) as profile_result:
+                result = build(job.report)
+        except JobCancelled:
+            job.state = 'cancelled'
+        except Exception as exc:
+            job.error = exc
+            job.state = 'failed'
+        else:
+            # Durum en son yazılır: 'done' görülünce sonuç hazırdır
+            job.result = result
+            job.spans = spans
+            job.profile_result = profile_result or None
+            job.state = 'done'
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pop(self, job_id):
+        """İşi kayıttan çıkar (sonuç alındıktan sonra)"""
+        with self._lock:
+            return self._jobs.pop(job_id, None)
+
+    def _expire(self):
+        # Çağıran kilidi tutar
+        now = time.monotonic()
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and now - job.created > JOB_TTL]:
+            del self._jobs[job_id]
+
+    def __len__(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
@@ -0,0 +1,318 @@
+"""PDF çıktı boyutu
+
+Teklifler WhatsApp / e-posta eki olarak gönderildiği için PDF küçük
+tutulur:
+- gömülen font alt kümelerinden ipucu (hinting) tabloları, glif
+  talimatları ve lisans metinlerini içeren uzun 'name' kayıtları çıkarılır,
+- filigran belgeye tek bir görüntü XObject'i olarak bir kez eklenir, her
+  sayfa onu yalnızca adıyla çizer,
+- logo rengi JPEG, saydamlığı ayrı bir SMask (Flate) olarak sıkıştırılır,
+- akışlar ASCII85 yerine ikili yazılır (binary_streams); reportlab bunu
+  süreç genelindeki rl_config.useA85 ile okuduğundan ayar yalnızca teklif
+  oluşturulurken kapatılır.
+
+Sıkıştırma FIYAT_PDF_COMPRESSION ile seçilir: 'jpeg' (varsayılan) ya da
+'flate' (kayıpsız); JPEG kalitesi FIYAT_PDF_JPEG_QUALITY ile (varsayılan 75).
+
+Filigran reportlab'ın özel (belgelenmemiş) alanlarını kullanır; sürüm
+requirements.txt'de sabitlenmiştir. Bu alanlar değişirse filigran düz
+drawImage ile çizilir.
+"""
+import hashlib
+import io
+import logging
+import os
+import re
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+
+from reportlab import rl_config
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace, TTFontMaker
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION = os.environ.get("FIYAT_PDF_COMPRESSION", "jpeg")
+JPEG_QUALITY = int(os.environ.get("FIYAT_PDF_JPEG_QUALITY", "75"))
+
+COMPRESSION_MODES = ('jpeg', 'flate')
+
+# Ekranda görünüm için gerekmeyen TrueType tabloları (ipucu programları)
+HINTING_TABLES = ('cvt ', 'fpgm', 'prep')
+# 'name' tablosunda tutulan kayıtlar: aile, stil, tam ad, PostScript adı
+NAME_IDS = (1, 2, 4, 6)
+
+# binary_streams içinde olan oluşturma sayısı ve önceki useA85 değeri
+_a85_lock = threading.Lock()
+_a85_users = 0
+_a85_saved = None
+
+# Basit glif nokta bayrakları
+X_SHORT = 0x02
+Y_SHORT = 0x04
+REPEAT = 0x08
+X_SAME = 0x10
+Y_SAME = 0x20
+
+# Bileşik glif bayrakları
+ARG_1_AND_2_ARE_WORDS = 0x0001
+WE_HAVE_A_SCALE = 0x0008
+MORE_COMPONENTS = 0x0020
+WE_HAVE_AN_X_AND_Y_SCALE = 0x0040
+WE_HAVE_A_TWO_BY_TWO = 0x0080
+WE_HAVE_INSTRUCTIONS = 0x0100
+
+
+def _read_tables(data):
+    count = struct.unpack('>H', data[4:6])[0]
+    tables = {}
+    for i in range(count):
+        tag, _, offset, length = struct.unpack('>4sLLL', data[12 + 16 * i:28 + 16 * i])
+        tables[tag.decode('latin1')] = data[offset:offset + length]
+    return tables
+
+
+def _points_end(glyph, pos, points):
+    # Bayrak ve koordinat dizilerinin bittiği konum (sondaki dolgu hariç)
+    coordinates = 0
+    while points > 0:
+        flags = glyph[pos]
+        repeat = 1
+        if flags & REPEAT:
+            repeat += glyph[pos + 1]
+            pos += 1
+        pos += 1
+        x_size = 1 if flags & X_SHORT else (0 if flags & X_SAME else 2)
+        y_size = 1 if flags & Y_SHORT else (0 if flags & Y_SAME else 2)
+        coordinates += (x_size + y_size) * repeat
+        points -= repeat
+    return pos + coordinates
+
+
+def _strip_glyph(glyph):
+    """Glifin TrueType talimatlarını ve sondaki dolguyu çıkar"""
+    if len(glyph) < 10:
+        return glyph
+    contours = struct.unpack('>h', glyph[:2])[0]
+    if contours >= 0:
+        start = 10 + 2 * contours
+        points = struct.unpack('>H', glyph[start - 2:start])[0] + 1 if contours else 0
+        length = struct.unpack('>H', glyph[start:start + 2])[0]
+        end = _points_end(glyph, start + 2 + length, points)
+        return glyph[:start] + b'\0\0' + glyph[start + 2 + length:end]
+
+    pos = 10
+    flags = MORE_COMPONENTS
+    while flags & MORE_COMPONENTS:
+        flags_pos = pos
+        flags = struct.unpack('>H', glyph[pos:pos + 2])[0]
+        pos += 4 + (4 if flags & ARG_1_AND_2_ARE_WORDS else 2)
+        if flags & WE_HAVE_A_SCALE:
+            pos += 2
+        elif flags & WE_HAVE_AN_X_AND_Y_SCALE:
+            pos += 4
+        elif flags & WE_HAVE_A_TWO_BY_TWO:
+            pos += 8
+    if not flags & WE_HAVE_INSTRUCTIONS:
+        return glyph[:pos]
+    return (glyph[:flags_pos] + struct.pack('>H', flags & ~WE_HAVE_INSTRUCTIONS)
+            + glyph[flags_pos + 2:pos])
+
+
+def _short_name_table(name):
+    """Yalnızca NAME_IDS kayıtlarını içeren 'name' tablosu"""
+    count, string_offset = struct.unpack('>HH', name[2:6])
+    records = []
+    strings = b''
+    for i in range(count):
+        platform, encoding, language, name_id, length, offset = struct.unpack('>6H', name[6 + 12 * i:18 + 12 * i])
+        if name_id in NAME_IDS:
+            text = name[string_offset + offset:string_offset + offset + length]
+            records.append((platform, encoding, language, name_id, length, len(strings)))
+            strings += text
+    header = struct.pack('>3H', 0, len(records), 6 + 12 * len(records))
+    return header + b''.join(struct.pack('>6H', *record) for record in records) + strings
+
+
+def compact_subset(data):
+    """reportlab'ın ürettiği TrueType alt kümesini küçült
+
+    İpucu tabloları ve glif talimatları çıkarılır, 'name' tablosu kısaltılır;
+    glif şekilleri ve ölçüleri değişmez.
+    """
+    tables = _read_tables(data)
+    head, maxp = tables['head'], tables['maxp']
+    long_loca = struct.unpack('>h', head[50:52])[0] == 1
+    num_glyphs = struct.unpack('>H', maxp[4:6])[0]
+    loca = struct.unpack(f'>{num_glyphs + 1}{"L" if long_loca else "H"}', tables['loca'])
+    if not long_loca:
+        loca = [offset * 2 for offset in loca]
+
+    glyf = tables['glyf']
+    glyphs = []
+    offsets = []
+    pos = 0
+    for start, end in zip(loca, loca[1:]):
+        glyph = _strip_glyph(glyf[start:end])
+        glyph += b'\0' * (-len(glyph) % 4)
+        offsets.append(pos)
+        glyphs.append(glyph)
+        pos += len(glyph)
+    offsets.append(pos)
+
+    output = TTFontMaker()
+    for tag, table in tables.items():
+        if tag not in HINTING_TABLES:
+            output.add(tag, table)
+    output.add('glyf', b''.join(glyphs))
+    if pos // 2 > 0xFFFF:
+        output.add('loca', struct.pack(f'>{len(offsets)}L', *offsets))
+        output.add('head', head[:50] + struct.pack('>h', 1) + head[52:])
+    else:
+        output.add('loca', struct.pack(f'>{len(offsets)}H', *(offset // 2 for offset in offsets)))
+        output.add('head', head[:50] + struct.pack('>h', 0) + head[52:])
+    if len(maxp) >= 28:
+        # maxSizeOfInstructions
+        output.add('maxp', maxp[:26] + b'\0\0' + maxp[28:])
+    output.add('name', _short_name_table(tables['name']))
+    return output.makeStream()
+
+
+@contextmanager
+def binary_streams():
+    """Blok süresince ASCII85 kodlamasını kapat (akışlar dörtte bir küçülür)
+
+    Eşzamanlı oluşturmalar sayılır; ayar ilk girişte kapatılır, son çıkışta
+    eski değerine döner. Bu sırada süreçteki diğer reportlab kullanıcıları da
+    ikili akış yazar.
+    """
+    global _a85_users, _a85_saved
+    with _a85_lock:
+        if _a85_users == 0:
+            _a85_saved = rl_config.useA85
+            rl_config.useA85 = 0
+        _a85_users += 1
+    try:
+        yield
+    finally:
+        with _a85_lock:
+            _a85_users -= 1
+            if _a85_users == 0:
+                rl_config.useA85 = _a85_saved
+
+
+class CompactTTFontFace(TTFontFace):
+    """Alt kümeleri compact_subset ile küçültülen TrueType yüzü"""
+
+    def makeSubset(self, subset):
+        return compact_subset(super().makeSubset(subset))
+
+
+class CompactTTFont(TTFont):
+    """Gömülürken küçültülen TrueType fontu"""
+
+    def __init__(self, name, filename, validate=0, subfontIndex=0, **kwargs):
+        super().__init__(name, filename, validate=validate, subfontIndex=subfontIndex, **kwargs)
+        # Font süreç başına bir kez kaydedilir; yüzün yeniden okunması önemsiz
+        self.face = CompactTTFontFace(filename, validate=validate, subfontIndex=subfontIndex)
+
+
+class WatermarkImage:
+    """Belge başına bir kez eklenen filigran görüntüsü
+
+    Renk ve saydamlık akışları süreç başına bir kez sıkıştırılır; çizimde
+    yalnızca bu hazır baytlar belgeye eklenir, sayfalar aynı XObject'e
+    başvurur.
+    """
+
+    def __init__(self, image, compression=COMPRESSION, quality=JPEG_QUALITY):
+        if compression not in COMPRESSION_MODES:
+            raise ValueError(f"Geçersiz PDF sıkıştırması: {compression} ({', '.join(COMPRESSION_MODES)})")
+        self.image = image
+        self.width, self.height = image.size
+        rgb = image.convert('RGB')
+        if compression == 'jpeg':
+            buffer = io.BytesIO()
+            rgb.save(buffer, 'JPEG', quality=quality, optimize=True)
+            self.color = buffer.getvalue()
+            self.color_filter = 'DCTDecode'
+        else:
+            self.color = zlib.compress(rgb.tobytes(), 9)
+            self.color_filter = 'FlateDecode'
+        self.alpha = zlib.compress(image.getchannel('A').tobytes(), 9)
+        self.name = 'Watermark' + hashlib.sha256(self.color + self.alpha).hexdigest()[:16]
+        self.fallback = False
+
+    def _image(self, name, content, color_space, image_filter):
+        image = pdfdoc.PDFImageXObject(name)
+        image.width, image.height = self.width, self.height
+        image.bitsPerComponent = 8
+        image.colorSpace = color_space
+        image.streamContent = content
+        image._filters = (image_filter,)
+        return image
+
+    def _add_to_document(self, canvas):
+        # Özel API: canvas._doc, _currentPageHasImages, PDFImageXObject._filters
+        if not canvas.hasForm(self.name):
+            doc = canvas._doc
+            mask = self._image(self.name + 'Alpha', self.alpha, 'DeviceGray', 'FlateDecode')
+            image = self._image(self.name, self.color, 'DeviceRGB', self.color_filter)
+            image.smask = doc.Reference(mask, doc.getXObjectName(mask.name))
+            doc.addForm(self.name, image)
+        canvas._currentPageHasImages = 1
+
+    def draw(self, canvas, x, y, width, height):
+        """Filigranı çiz; görüntü belgeye ilk sayfada eklenir"""
+        if not self.fallback:
+            try:
+                self._add_to_document(canvas)
+            except (AttributeError, TypeError) as e:
+                logger.warning("Sıkıştırılmış filigran eklenemedi: %s. drawImage kullanılacak.", e)
+                self.fallback = True
+        if self.fallback:
+            canvas.drawImage(ImageReader(self.image), x, y, width, height, mask='auto')
+            return
+        canvas.saveState()
+        canvas.translate(x, y)
+        canvas.scale(width, height)
+        canvas.doForm(self.name)
+        canvas.restoreState()
+
+
+_OBJECT = re.compile(rb'(\d+) 0 obj\r?\n(.*?)endobj', re.S)
+_REFERENCE = rb'/%s (\d+) 0 R'
+
+
+@lru_cache(maxsize=8)
+def size_breakdown(pdf):
+    """PDF baytlarının nesne türüne göre dağılımı: {tür: bayt}
+
+    Türler: Font (font dosyaları, sözlükler, ToUnicode), Görüntü, Sayfa
+    içeriği ve Diğer (katalog, sayfa ağacı, xref...).
+    """
+    objects = {}
+    kinds = {}
+    for number, body in _OBJECT.findall(pdf):
+        number = int(number)
+        objects[number] = len(body)
+        head = body[:400]
+        if b'/Subtype /Image' in head:
+            kinds[number] = 'Görüntü'
+        elif b'/Length1' in head or b'/Type /Font' in head or b'/Type /FontDescriptor' in head:
+            kinds[number] = 'Font'
+    for key, kind in ((b'ToUnicode', 'Font'), (b'Contents', 'Sayfa içeriği')):
+        for number in re.findall(_REFERENCE % key, pdf):
+            kinds[int(number)] = kind
+
+    breakdown = {'Font': 0, 'Görüntü': 0, 'Sayfa içeriği': 0}
+    for number, size in objects.items():
+        kind = kinds.get(number)
+        if kind:
+            breakdown[kind] += size
+    breakdown['Diğer'] = len(pdf) - sum(breakdown.values())
+    return breakdown
@@ -0,0 +1,196 @@
+"""Toplu fiyat listesi içe/dışa aktarma
+
+CSV ve XLSX dosyaları parça parça okunur; büyük tedarikçi listeleri hiçbir
+zaman tek seferde belleğe alınmaz. Her parça vektörel olarak doğrulanır
+(boş ad, sayı olmayan, negatif ya da çok büyük fiyat / miktar, 0-100 dışı
+KDV, yinelenen ad) ve geçerli satırlar
+hedefe (teklif listesi ya da katalog) aktarılır.
+"""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from catalog import fold_turkish
+from product_store import COLUMNS, MAX_QUANTITY, MAX_UNIT_PRICE
+
+CHUNK_SIZE = 10_000
+
+# Başlık (katlanmış) -> alan adı
+HEADER_ALIASES = {
+    'name': 'name', 'urun': 'name', 'urun adi': 'name', 'ad': 'name',
+    'unit_price': 'unit_price', 'fiyat': 'unit_price', 'birim fiyat': 'unit_price',
+    'kilogram fiyati': 'unit_price', 'kdv haric (tl/kg)': 'unit_price',
+    'vat_rate': 'vat_rate', 'vat': 'vat_rate', 'kdv': 'vat_rate', 'kdv %': 'vat_rate', 'kdv (%)': 'vat_rate',
+    'quantity': 'quantity', 'miktar': 'quantity', 'miktar (kg)': 'quantity',
+    'category': 'category', 'kategori': 'category',
+}
+
+EXPORT_HEADERS = {
+    'name': 'Ürün Adı',
+    'unit_price': 'KDV Hariç (TL/kg)',
+    'vat_rate': 'KDV %',
+    'quantity': 'Miktar (kg)',
+    'category': 'Kategori',
+}
+
+MAX_REPORTED_ERRORS = 100
+
+
+def _rename_columns(frame):
+    renamed = frame.rename(columns=lambda c: HEADER_ALIASES.get(fold_turkish(str(c)), c))
+    if 'name' not in renamed or 'unit_price' not in renamed:
+        raise ValueError("Fiyat listesinde ürün adı ve fiyat sütunları bulunmalı (name, unit_price)")
+    return renamed
+
+
+def _read_csv_chunks(f, chunksize):
+    # Ayırıcıyı ilk satırdan bul (Türkçe Excel ';' kullanır)
+    start = f.tell()
+    head = f.read(4096)
+    f.seek(start)
+    if isinstance(head, bytes):
+        head = head.decode('utf-8-sig', errors='ignore')
+    first_line = head.splitlines()[0] if head else ''
+    sep = max([',', ';', '\t'], key=first_line.count)
+    yield from pd.read_csv(f, chunksize=chunksize, dtype=str, encoding='utf-8-sig',
+                           sep=sep, keep_default_na=False)
+
+
+def _read_xlsx_chunks(f, chunksize):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(f, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(h) if h is not None else '' for h in next(rows, [])]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_chunks(f, filename, chunksize=CHUNK_SIZE):
+    """Dosyayı uzantısına göre parça parça DataFrame olarak oku"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        chunks = _read_xlsx_chunks(f, chunksize)
+    elif ext in ('.csv', '.txt'):
+        chunks = _read_csv_chunks(f, chunksize)
+    else:
+        raise ValueError(f"Desteklenmeyen dosya türü: {ext}")
+    for chunk in chunks:
+        yield _rename_columns(chunk)
+
+
+def _to_number(series):
+    # "12,50" gibi virgüllü ondalıkları da kabul et
+    if not pd.api.types.is_numeric_dtype(series):
+        series = series.astype(str).str.strip().str.replace(',', '.', regex=False)
+    return pd.to_numeric(series, errors='coerce')
+
+
+def _to_vat_rate(series):
+    # "%18" / "18" / "18,5"; boş hücre varsayılan %1 olur, diğer metinler NaN kalır
+    empty = series.isna()
+    if not pd.api.types.is_numeric_dtype(series):
+        text = series.astype(str).str.strip()
+        empty |= text == ''
+        series = text.str.replace(r'^%\s*', '', regex=True)
+    return _to_number(series).mask(empty, 1.0)
+
+
+def validate_chunk(chunk, seen, first_row=0):
+    """Parçayı vektörel doğrula; (geçerli satırlar, hatalar) döndür
+
+    seen: önceki parçalarda görülen (katlanmış) ürün adları, yerinde güncellenir.
+    first_row: parçanın dosyadaki ilk veri satırının numarası.
+    """
+    frame = pd.DataFrame({
+        'name': chunk['name'].fillna('').astype(str).str.strip(),
+        'unit_price': _to_number(chunk['unit_price']),
+        'vat_rate': _to_vat_rate(chunk['vat_rate']) if 'vat_rate' in chunk else 1.0,
+        'quantity': _to_number(chunk['quantity']) if 'quantity' in chunk else float('nan'),
+        'category': chunk['category'].fillna('').astype(str).str.strip() if 'category' in chunk else '',
+    })
+    keys = frame['name'].map(fold_turkish)
+    quantity = frame['quantity']
+
+    checks = [
+        (frame['name'] == '', "Ürün adı boş"),
+        # NaN, "inf", "1e400" gibi sonlu olmayan değerler
+        (~np.isfinite(frame['unit_price']), "Fiyat sayı değil"),
+        (frame['unit_price'] < 0, "Negatif fiyat"),
+        (frame['unit_price'] > MAX_UNIT_PRICE, f"Fiyat {MAX_UNIT_PRICE:,} TL/kg üstünde".replace(',', '.')),
+        (~np.isfinite(frame['vat_rate']), "KDV sayı değil"),
+        ((frame['vat_rate'] < 0) | (frame['vat_rate'] > 100), "KDV 0-100 aralığında değil"),
+        # Miktar boş olabilir; doluysa 0 ile MAX_QUANTITY arasında olmalı
+        (quantity.notna() & ~((quantity >= 0) & (quantity <= MAX_QUANTITY)),
+         f"Miktar 0-{MAX_QUANTITY:,} kg aralığında değil".replace(',', '.')),
+    ]
+    invalid = pd.Series(False, index=frame.index)
+    reasons = pd.Series('', index=frame.index)
+    for mask, reason in checks:
+        mask = mask & ~invalid  # her satır için ilk hata
+        reasons[mask] = reason
+        invalid |= mask
+
+    # Yinelenen adlar yalnızca diğer açılardan geçerli satırlar arasında aranır
+    seen_before = np.fromiter((key in seen for key in keys.tolist()), dtype=bool, count=len(keys))
+    duplicate = ~invalid & (keys.where(~invalid).duplicated() | seen_before)
+    reasons[duplicate] = "Yinelenen ürün adı"
+    invalid |= duplicate
+
+    errors = pd.DataFrame({
+        'Satır': np.flatnonzero(invalid.to_numpy()) + first_row + 2,  # başlık + 1 tabanlı
+        'Ürün Adı': frame.loc[invalid, 'name'].to_numpy(),
+        'Hata': reasons[invalid].to_numpy(),
+    })
+    seen.update(keys[~invalid])
+    return frame[~invalid].reset_index(drop=True), errors.reset_index(drop=True)
+
+
+def import_price_list(f, filename, sink, chunksize=CHUNK_SIZE):
+    """Fiyat listesini parça parça doğrulayıp geçerli satırları sink(frame) ile aktar
+
+    Dönen özet: okunan / aktarılan satır sayısı, hata sayıları ve ilk
+    MAX_REPORTED_ERRORS hata.
+    """
+    seen = set()
+    rows = imported = 0
+    error_counts = {}
+    reported = []
+    for chunk in iter_chunks(f, filename, chunksize):
+        valid, errors = validate_chunk(chunk, seen, first_row=rows)
+        rows += len(chunk)
+        if len(valid):
+            sink(valid)
+            imported += len(valid)
+        for reason, count in errors['Hata'].value_counts().items():
+            error_counts[reason] = error_counts.get(reason, 0) + int(count)
+        if len(reported) < MAX_REPORTED_ERRORS and len(errors):
+            reported.extend(errors.head(MAX_REPORTED_ERRORS - len(reported)).to_dict('records'))
+    return {
+        'rows': rows,
+        'imported': imported,
+        'error_counts': error_counts,
+        'errors': pd.DataFrame(reported, columns=['Satır', 'Ürün Adı', 'Hata']),
+    }
+
+
+def export_price_list(products, fmt='csv'):
+    """Ürün listesini CSV ya da XLSX olarak bayt şeklinde döndür"""
+    frame = products.frame[COLUMNS].rename(columns=EXPORT_HEADERS)
+    if fmt == 'xlsx':
+        buffer = io.BytesIO()
+        frame.to_excel(buffer, index=False, sheet_name='Fiyat Listesi')
+        return buffer.getvalue()
+    # Excel'in Türkçe karakterleri doğru açması için BOM'lu UTF-8
+    return frame.to_csv(index=False).encode('utf-8-sig')
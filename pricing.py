@@ -0,0 +1,204 @@
+"""Çoklu para birimi ve miktar kademeli fiyatlandırma
+
+Her ürün satırı (KDV hariç TL/kg) para birimi x kademe matrisine çevrilir.
+Hesap tek bir numpy yayınlamasıyla, kuruş / sent cinsinden tam sayılarla
+yapılır; yuvarlama ürün deposundaki gibi yarımı yukarıdır.
+
+Kurlar yerel bir CSV tablosundan okunur (FIYAT_RATES_FILE, varsayılan
+kurlar.csv; sütunlar: date, currency, rate = 1 birimin TL karşılığı).
+Tablo dosya değiştikçe yeniden okunur, bir güne ait kurlar önbelleklenir:
+her para birimi için o tarihte ya da öncesindeki en yakın tarihteki kur
+kullanılır. Teklifte gösterilen kur tarihi, kullanılan kurların en eskisidir.
+"""
+import os
+from datetime import date, datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from product_store import _div_round
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Kur tablosu (FIYAT_RATES_FILE ile değiştirilebilir)
+RATES_FILE = os.environ.get("FIYAT_RATES_FILE", os.path.join(APP_DIR, "kurlar.csv"))
+
+BASE_CURRENCY = 'TRY'
+CURRENCY_LABELS = {'TRY': 'TL', 'EUR': '€', 'USD': '$', 'GBP': '£'}
+CURRENCY_NAMES = {'TRY': 'Türk Lirası', 'EUR': 'Euro', 'USD': 'ABD Doları', 'GBP': 'İngiliz Sterlini'}
+
+# (en az kg, indirim %)
+DEFAULT_TIERS = ((1, 0.0), (25, 5.0), (1000, 10.0))
+
+# Kurlar milyonda bir TL hassasiyetiyle tam sayıya çevrilir
+RATE_SCALE = 1_000_000
+
+
+@lru_cache(maxsize=4)
+def _load_rates(path, mtime):
+    table = pd.read_csv(path, dtype={'currency': str}, encoding='utf-8-sig')
+    missing = {'date', 'currency', 'rate'} - set(table.columns)
+    if missing:
+        raise ValueError(f"Kur tablosunda eksik sütun: {', '.join(sorted(missing))}")
+    table['date'] = pd.to_datetime(table['date']).dt.date
+    table['currency'] = table['currency'].str.strip().str.upper()
+    table['rate'] = pd.to_numeric(table['rate'], errors='coerce')
+    table = table.dropna(subset=['rate'])
+    return table[table['rate'] > 0].sort_values('date', kind='stable')
+
+
+@lru_cache(maxsize=256)
+def _rates_on(path, mtime, day):
+    table = _load_rates(path, mtime)
+    known = table[table['date'] <= day]
+    if known.empty:
+        raise ValueError(f"{day:%d.%m.%Y} veya öncesine ait kur bulunamadı")
+    latest = known.groupby('currency').tail(1)
+    dates = dict(zip(latest['currency'], latest['date']))
+    rates = dict(zip(latest['currency'], latest['rate'].astype(float)))
+    rates[BASE_CURRENCY] = 1.0
+    return dates, rates
+
+
+def rates_for(day, path=None):
+    """Verilen gün için ({para birimi: kur tarihi}, {para birimi: TL karşılığı}) döndür"""
+    path = path or RATES_FILE
+    if not os.path.exists(path):
+        raise ValueError(f"Kur tablosu bulunamadı: {path}")
+    if isinstance(day, datetime):
+        day = day.date()
+    return _rates_on(path, os.path.getmtime(path), day)
+
+
+def available_currencies(path=None):
+    """Kur tablosundaki para birimleri (TL dahil), tablo yoksa yalnızca TL"""
+    path = path or RATES_FILE
+    if not os.path.exists(path):
+        return [BASE_CURRENCY]
+    table = _load_rates(path, os.path.getmtime(path))
+    return [BASE_CURRENCY] + sorted(set(table['currency']) - {BASE_CURRENCY})
+
+
+def save_rates(data, path=None):
+    """Yüklenen kur tablosunu (CSV baytları) doğrulayıp kaydet"""
+    path = path or RATES_FILE
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    try:
+        _load_rates.__wrapped__(tmp_path, 0)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def tier_label(min_kg):
+    return f"{min_kg / 1000:g}+ ton" if min_kg >= 1000 else f"{min_kg:g}+ kg"
+
+
+class Pricing:
+    """Teklif fiyatlandırması: para birimleri, kademeler ve kullanılan kurlar"""
+
+    def __init__(self, currencies=(BASE_CURRENCY,), tiers=DEFAULT_TIERS, rates=None, rates_date=None):
+        self.currencies = tuple(currencies)
+        self.tiers = tuple(sorted((float(min_kg), float(discount)) for min_kg, discount in tiers))
+        self.rates = dict(rates or {BASE_CURRENCY: 1.0})
+        self.rates_date = rates_date
+        if not self.currencies:
+            raise ValueError("En az bir para birimi seçilmeli")
+        if not self.tiers:
+            raise ValueError("En az bir kademe gerekli")
+        # Yinelenen para birimi ya da kademe tabloda aynı adlı sütunlar üretir
+        if len(set(self.currencies)) != len(self.currencies):
+            raise ValueError("Para birimleri yinelenmemeli")
+        if len({min_kg for min_kg, _ in self.tiers}) != len(self.tiers):
+            raise ValueError("Kademe alt sınırları (en az kg) yinelenmemeli")
+        missing = [c for c in self.currencies if c not in self.rates]
+        if missing:
+            raise ValueError(f"Kur bulunamadı: {', '.join(missing)}")
+        if any(not 0 <= discount < 100 for _, discount in self.tiers):
+            raise ValueError("Kademe indirimi 0-100 aralığında olmalı")
+
+    @classmethod
+    def for_day(cls, day, currencies, tiers=DEFAULT_TIERS, path=None):
+        """O günün kurlarıyla fiyatlandırma (yalnızca TL ise kur tablosu gerekmez)"""
+        if all(c == BASE_CURRENCY for c in currencies):
+            return cls(currencies, tiers)
+        dates, rates = rates_for(day, path)
+        # Bir para biriminin kuru eskiyse teklif o tarihle etiketlenir
+        used = [dates[c] for c in currencies if c in dates]
+        return cls(currencies, tiers, {c: rates[c] for c in currencies if c in rates} | {BASE_CURRENCY: 1.0},
+                   min(used) if used else None)
+
+    @property
+    def shape(self):
+        return len(self.currencies), len(self.tiers)
+
+    def column_labels(self):
+        """Matris sütunları sırasıyla (para birimi, kademe etiketi)"""
+        return [(currency, tier_label(min_kg)) for currency in self.currencies for min_kg, _ in self.tiers]
+
+    def matrix_cents(self, products):
+        """(ürün, para birimi, kademe) boyutlu fiyat matrisi, sent / kuruş cinsinden"""
+        price = np.rint(products.frame['unit_price'].to_numpy() * 100).astype(np.int64)
+        discount_bp = np.rint(np.array([d for _, d in self.tiers]) * 100).astype(np.int64)
+        rate = np.rint(np.array([self.rates[c] for c in self.currencies]) * RATE_SCALE).astype(np.int64)
+        # Önce TL'de kademe indirimi, sonra kura bölme (her adım yarımı yukarı yuvarlanır)
+        tier_kurus = _div_round(price[:, None] * (10000 - discount_bp)[None, :], 10000)
+        return _div_round(tier_kurus[:, None, :] * RATE_SCALE, rate[None, :, None])
+
+    def matrix(self, products):
+        return self.matrix_cents(products) / 100
+
+    def matrix_frame(self, products):
+        """Ekranda gösterilecek düz tablo: ürün adı ve her para birimi x kademe sütunu"""
+        values = self.matrix(products).reshape(len(products), -1)
+        frame = pd.DataFrame(values, columns=[f"{CURRENCY_LABELS.get(c, c)} {t}" for c, t in self.column_labels()])
+        frame.insert(0, 'Ürün Adı', products.frame['name'].to_numpy())
+        return frame
+
+    def table_rows(self, products):
+        """PDF tablosu için biçimlendirilmiş satırlar: ad, KDV %, fiyatlar"""
+        values = self.matrix(products).reshape(len(products), -1)
+        frame = products.frame
+        cells = np.char.mod('%.2f', values)
+        vat = frame['vat_rate'].map('%{:.0f}'.format)
+        return [[name, rate, *prices] for name, rate, prices in zip(frame['name'], vat, cells.tolist())]
+
+    def notes(self):
+        """PDF notlarının para birimi, kur ve kademe maddeleri"""
+        names = [CURRENCY_NAMES.get(c, c) for c in self.currencies]
+        lines = [f"Fiyatlar {', '.join(names)} cinsinden, KDV hariç ve kilogram başınadır."]
+        foreign = [c for c in self.currencies if c != BASE_CURRENCY]
+        if foreign:
+            rates = ', '.join(f"1 {c} = {self.rates[c]:.4f} TL" for c in foreign)
+            lines.append(f"Döviz fiyatları {self.rates_date:%d.%m.%Y} tarihli kurlarla hesaplanmıştır ({rates}).")
+        if len(self.tiers) > 1:
+            lines.append("Kademe fiyatları belirtilen miktar ve üzerindeki siparişler için geçerlidir.")
+        return lines
+
+    def headers(self):
+        """PDF tablosu başlıkları: ad, KDV % ve her para birimi x kademe sütunu"""
+        return ('Ürün Adı', 'KDV %',
+                *(f"{CURRENCY_LABELS.get(c, c)}\n{tier}" for c, tier in self.column_labels()))
+
+    def to_dict(self):
+        return {
+            'currencies': list(self.currencies),
+            'tiers': [list(tier) for tier in self.tiers],
+            'rates': {c: self.rates[c] for c in self.currencies},
+            'rates_date': self.rates_date.isoformat() if self.rates_date else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        rates_date = date.fromisoformat(data['rates_date']) if data.get('rates_date') else None
+        return cls(data['currencies'], data['tiers'], data['rates'], rates_date)
+
+    def __eq__(self, other):
+        return isinstance(other, Pricing) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Pricing({self.to_dict()!r})"
@@ -0,0 +1,167 @@
+"""Sütunlu ürün deposu
+
+Ürünler tek bir pandas DataFrame'de tutulur. KDV dahil birim fiyat,
+satır tutarları, oran bazında KDV dökümü ve genel toplamlar tek bir
+vektörel geçişte kuruş cinsinden tam sayılarla hesaplanır; yuvarlama
+yarımı yukarı (Decimal ROUND_HALF_UP ile aynı) yapılır. Ekrandaki tablo
+ve PDF tablosu bu depodan üretilir.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['name', 'unit_price', 'vat_rate', 'quantity', 'category']
+
+DTYPES = {
+    'name': 'object',
+    'unit_price': 'float64',
+    'vat_rate': 'float64',
+    'quantity': 'float64',  # NaN: miktar belirtilmemiş
+    'category': 'object',  # boş: kategorisiz
+}
+
+# Kuruş / gram cinsinden int64 hesapların taşmadığı üst sınırlar
+# (fiyat x miktar x KDV baz puanı < 2**63)
+MAX_UNIT_PRICE = 1_000_000  # TL/kg
+MAX_QUANTITY = 1_000_000  # kg
+
+
+def _empty_frame():
+    return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in DTYPES.items()})
+
+
+def _div_round(numerator, denominator):
+    """Tam sayı bölmesi, yarımı yukarı yuvarlar (negatif olmayan değerler için)"""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+class ProductStore:
+    """Ürün listesi ve vektörel fiyat hesapları"""
+
+    def __init__(self, frame=None):
+        self._frame = _empty_frame() if frame is None else self._normalize(frame)
+        self._computed = None
+
+    @staticmethod
+    def _normalize(frame):
+        frame = frame.reindex(columns=COLUMNS).reset_index(drop=True)
+        frame['name'] = frame['name'].fillna('').astype(str).str.strip()
+        frame['unit_price'] = pd.to_numeric(frame['unit_price'], errors='coerce').fillna(0.0)
+        frame['vat_rate'] = pd.to_numeric(frame['vat_rate'], errors='coerce').fillna(1.0)
+        frame['quantity'] = pd.to_numeric(frame['quantity'], errors='coerce')
+        frame['category'] = frame['category'].fillna('').astype(str).str.strip()
+        return frame.astype(DTYPES)
+
+    @classmethod
+    def from_records(cls, records):
+        """Sözlük listesinden depo oluştur (name, unit_price, vat_rate, quantity, category)"""
+        return cls(pd.DataFrame(list(records), columns=COLUMNS))
+
+    @classmethod
+    def coerce(cls, products):
+        """ProductStore ya da sözlük listesini ProductStore'a çevir"""
+        return products if isinstance(products, cls) else cls.from_records(products)
+
+    @property
+    def frame(self):
+        return self._frame
+
+    def __len__(self):
+        return len(self._frame)
+
+    def __bool__(self):
+        return len(self._frame) > 0
+
+    def _changed(self):
+        self._computed = None
+
+    def set_frame(self, frame):
+        self._frame = self._normalize(frame)
+        self._changed()
+
+    def append(self, name, unit_price, vat_rate, quantity=None, category=''):
+        row = pd.DataFrame([{'name': name, 'unit_price': unit_price, 'vat_rate': vat_rate,
+                             'quantity': quantity, 'category': category}], columns=COLUMNS)
+        self.set_frame(pd.concat([self._frame, row], ignore_index=True) if len(self._frame) else row)
+
+    def extend(self, frame):
+        """Birden çok ürünü tek seferde ekle (name, unit_price, vat_rate, quantity, category sütunları)"""
+        frame = self._normalize(frame)
+        self.set_frame(pd.concat([self._frame, frame], ignore_index=True) if len(self._frame) else frame)
+
+    def clear(self):
+        self._frame = _empty_frame()
+        self._changed()
+
+    @property
+    def has_quantities(self):
+        return bool(self._frame['quantity'].notna().any())
+
+    def computed(self):
+        """Fiyat hesaplarını içeren tablo (değişene kadar önbellekte tutulur)"""
+        if self._computed is not None:
+            return self._computed
+
+        frame = self._frame
+        # Kuruş, KDV için onbinde bir, miktar için gram cinsinden tam sayılar
+        price = np.rint(frame['unit_price'].to_numpy() * 100).astype(np.int64)
+        vat_bp = np.rint(frame['vat_rate'].to_numpy() * 100).astype(np.int64)
+        has_qty = frame['quantity'].notna().to_numpy()
+        grams = np.rint(np.nan_to_num(frame['quantity'].to_numpy()) * 1000).astype(np.int64)
+
+        vat_price = _div_round(price * (10000 + vat_bp), 10000)
+        net_total = np.where(has_qty, _div_round(price * grams, 1000), 0)
+        vat_amount = _div_round(net_total * vat_bp, 10000)
+
+        computed = frame.copy()
+        computed['vat_price'] = vat_price / 100
+        computed['net_total'] = net_total / 100
+        computed['vat_amount'] = vat_amount / 100
+        computed['line_total'] = (net_total + vat_amount) / 100
+        self._computed = computed
+        return computed
+
+    def vat_breakdown(self):
+        """KDV oranı bazında matrah ve KDV tutarları"""
+        computed = self.computed()
+        return (computed[computed['quantity'].notna()]
+                .groupby('vat_rate', sort=True)[['net_total', 'vat_amount', 'line_total']]
+                .sum()
+                .reset_index())
+
+    def totals(self):
+        """Genel toplamlar (yalnızca miktarı belirtilmiş satırlar)"""
+        computed = self.computed()
+        net = int(np.rint(computed['net_total'].to_numpy() * 100).sum())
+        vat = int(np.rint(computed['vat_amount'].to_numpy() * 100).sum())
+        return {'net_total': net / 100, 'vat_amount': vat / 100, 'line_total': (net + vat) / 100}
+
+    def editor_frame(self):
+        """Ekrandaki ürün tablosu: düzenlenebilir alanlar ve hesaplanmış sütunlar"""
+        computed = self.computed()
+        return pd.DataFrame({
+            'Sıra': range(1, len(computed) + 1),
+            'Ürün Adı': computed['name'],
+            'Kategori': computed['category'],
+            'KDV Hariç (TL/kg)': computed['unit_price'],
+            'KDV %': computed['vat_rate'],
+            'Miktar (kg)': computed['quantity'],
+            'KDV Dahil (TL/kg)': computed['vat_price'],
+            'Tutar (KDV Dahil)': computed['line_total'].where(computed['quantity'].notna()),
+        })
+
+    def table_rows(self, with_quantities=None):
+        """PDF tablosu için biçimlendirilmiş satırlar (başlık hariç)"""
+        if with_quantities is None:
+            with_quantities = self.has_quantities
+        computed = self.computed()
+        columns = [
+            computed['name'],
+            computed['unit_price'].map('{:.2f} TL/kg'.format),
+            computed['vat_rate'].map('%{:.0f}'.format),
+            computed['vat_price'].map('{:.2f} TL/kg'.format),
+        ]
+        if with_quantities:
+            has_qty = computed['quantity'].notna()
+            columns.append(computed['quantity'].map('{:g} kg'.format).where(has_qty, '-'))
+            columns.append(computed['line_total'].map('{:.2f} TL'.format).where(has_qty, '-'))
+        return [list(row) for row in zip(*columns)]
@@ -0,0 +1,154 @@
+"""İçerik adresli PDF önbelleği
+
+Anahtar; müşteri, ilgili kişi, ürün satırları, şablon sürümü, logo özeti,
+varsa fiyatlandırma (para birimleri, kademeler, kurlar), PDF sıkıştırma
+ayarları ve teklif gününün (saat hariç) SHA-256 özetidir. İki katman vardır:
+sınırlı boyutlu bellek içi LRU ve toplam boyuta göre en eski dosyaları
+silen disk katmanı.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from fonts import CACHE_DIR
+from product_store import ProductStore
+
+# Disk katmanı klasörü ve sınırları
+PDF_CACHE_DIR = os.path.join(CACHE_DIR, "pdf")
+MAX_MEMORY_ITEMS = 64
+MAX_DISK_BYTES = 100 * 1024 * 1024
+
+
+def quote_key(customer, contact, products, today, pricing=None):
+    """Teklif girdilerinden içerik adresli önbellek anahtarı üret"""
+    import pdf_output  # PDF yığını ilk teklifte yüklenir
+    import quote_pdf
+
+    frame = ProductStore.coerce(products).frame
+    rows = [
+        [name, unit_price, vat_rate, None if quantity != quantity else quantity, category]
+        for name, unit_price, vat_rate, quantity, category
+        in frame[['name', 'unit_price', 'vat_rate', 'quantity', 'category']].itertuples(index=False)
+    ]
+    fields = {
+        'template': quote_pdf.TEMPLATE_VERSION,
+        'logo': quote_pdf.get_logo_hash(),
+        'output': [pdf_output.COMPRESSION, pdf_output.JPEG_QUALITY],
+        'day': today.strftime('%Y-%m-%d'),
+        'customer': customer,
+        'contact': (contact or '').strip(),
+        'products': rows,
+    }
+    # Yalnızca TL tekliflerinin anahtarı önceki sürümlerle aynı kalır
+    if pricing is not None:
+        fields['pricing'] = pricing.to_dict()
+    payload = json.dumps(
+        fields,
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class QuoteCache:
+    """Bellek (LRU) ve disk katmanlı PDF önbelleği"""
+
+    def __init__(self, disk_dir=PDF_CACHE_DIR, max_items=MAX_MEMORY_ITEMS, max_disk_bytes=MAX_DISK_BYTES):
+        self.disk_dir = disk_dir
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pdf")
+
+    def _remember(self, key, data):
+        # Çağıran kilidi tutar
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Önbellekteki PDF'i döndür, yoksa None"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return data
+
+        if self.disk_dir:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                os.utime(path)  # LRU için son kullanım zamanı
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self._remember(key, data)
+                    self.stats['disk_hits'] += 1
+                return data
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def put(self, key, data):
+        """PDF'i her iki katmana yaz"""
+        with self._lock:
+            self._remember(key, data)
+        if self.disk_dir:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.part')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self._evict_disk()
+
+    def get_or_build(self, key, build):
+        """Önbellekte varsa döndür, yoksa build() ile oluşturup sakla"""
+        data = self.get(key)
+        if data is None:
+            data = build()
+            self.put(key, data)
+        return data
+
+    def _evict_disk(self):
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.pdf'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        # En uzun süredir kullanılmayan dosyalardan başlayarak sil
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def disk_usage(self):
+        """Disk katmanındaki dosya sayısı ve toplam boyut (bayt)"""
+        if not self.disk_dir:
+            return 0, 0
+        sizes = [entry.stat().st_size for entry in os.scandir(self.disk_dir) if entry.name.endswith('.pdf')]
+        return len(sizes), sum(sizes)
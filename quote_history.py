@@ -0,0 +1,229 @@
+"""Teklif arşivi
+
+Oluşturulan her teklif (üst bilgiler, ürün satırları, PDF önbellek
+anahtarı) yalnızca eklenebilen bir SQLite veritabanında WAL kipinde
+saklanır. Teklif numaraları atomik bir sayaçtan gelir; müşteri, tarih
+ve ürün adı üzerindeki dizinler geçmiş aramalarını hızlı tutar. Müşteri ve
+ürün adları ayrıca kelime kelime dizinlenir; "burger" araması "Saloon
+Burger" teklifini de bulur.
+"""
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from catalog import fold_turkish
+from pricing import Pricing
+from product_store import ProductStore
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Arşiv veritabanı (FIYAT_HISTORY_DB ile değiştirilebilir)
+HISTORY_DB = os.environ.get("FIYAT_HISTORY_DB", os.path.join(APP_DIR, "teklifler.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sequences (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY,
+    quote_no TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    customer TEXT NOT NULL,
+    customer_key TEXT NOT NULL,
+    contact TEXT NOT NULL DEFAULT '',
+    product_count INTEGER NOT NULL,
+    total REAL NOT NULL DEFAULT 0,
+    cache_key TEXT,
+    pdf BLOB,
+    pricing TEXT
+);
+CREATE TABLE IF NOT EXISTS quote_items (
+    quote_id INTEGER NOT NULL REFERENCES quotes(id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    unit_price REAL NOT NULL,
+    vat_rate REAL NOT NULL,
+    quantity REAL,
+    category TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (quote_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS quote_tokens (
+    field TEXT NOT NULL,
+    token TEXT NOT NULL,
+    quote_id INTEGER NOT NULL REFERENCES quotes(id),
+    PRIMARY KEY (field, token, quote_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_quotes_created ON quotes(created_at);
+CREATE INDEX IF NOT EXISTS ix_quotes_customer ON quotes(customer_key, created_at);
+CREATE INDEX IF NOT EXISTS ix_quotes_cache_key ON quotes(cache_key);
+CREATE INDEX IF NOT EXISTS ix_items_name ON quote_items(name_key, quote_id);
+"""
+
+QUOTE_COLUMNS = ['id', 'quote_no', 'created_at', 'customer', 'contact', 'product_count', 'total', 'cache_key']
+
+
+def _prefix_range(key):
+    # "isot" -> [isot, isot\uffff): dizinli önek araması
+    return key, key + "\uffff"
+
+
+def _tokens(field, key, quote_id):
+    # Katalog dizinindeki gibi: adın tamamı ve her kelimesi
+    return [(field, token, quote_id) for token in {key, *key.split()} if token]
+
+
+def _quote_tokens(quote_id, customer_key, name_keys):
+    rows = _tokens('customer', customer_key, quote_id)
+    for name_key in set(name_keys):
+        rows.extend(_tokens('item', name_key, quote_id))
+    return rows
+
+
+class QuoteHistory:
+    """Teklif arşivi ve teklif numarası sayacı"""
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            has_tokens = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'quote_tokens'"
+            ).fetchone()
+            conn.executescript(SCHEMA)
+            # Kategori sütunu sonradan eklendi; eski arşivleri yükselt
+            item_columns = {row[1] for row in conn.execute("PRAGMA table_info(quote_items)")}
+            if 'category' not in item_columns:
+                conn.execute("ALTER TABLE quote_items ADD COLUMN category TEXT NOT NULL DEFAULT ''")
+            # Fiyatlandırma (para birimleri, kademeler, kurlar) JSON olarak saklanır
+            quote_columns = {row[1] for row in conn.execute("PRAGMA table_info(quotes)")}
+            if 'pricing' not in quote_columns:
+                conn.execute("ALTER TABLE quotes ADD COLUMN pricing TEXT")
+            # Kelime dizini sonradan eklendi; eski tekliflerin kelimelerini doldur
+            if not has_tokens:
+                self._backfill_tokens(conn)
+
+    @staticmethod
+    def _backfill_tokens(conn):
+        names = {}
+        for quote_id, name_key in conn.execute("SELECT quote_id, name_key FROM quote_items"):
+            names.setdefault(quote_id, []).append(name_key)
+        rows = []
+        for quote_id, customer_key in conn.execute("SELECT id, customer_key FROM quotes"):
+            rows.extend(_quote_tokens(quote_id, customer_key, names.get(quote_id, ())))
+        conn.executemany("INSERT OR IGNORE INTO quote_tokens (field, token, quote_id) VALUES (?, ?, ?)", rows)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def next_quote_no(self, today):
+        """Atomik sayaçtan yeni teklif numarası al (BLD-YYYYAAGG-000123)"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT OR IGNORE INTO sequences (name, value) VALUES ('quote', 0)")
+            value = conn.execute(
+                "UPDATE sequences SET value = value + 1 WHERE name = 'quote' RETURNING value"
+            ).fetchone()[0]
+        return f"BLD-{today.strftime('%Y%m%d')}-{value:06d}"
+
+    def record(self, quote_no, created_at, customer, contact, products, cache_key=None, pdf=None,
+               pricing=None):
+        """Teklifi ve ürün satırlarını arşive ekle, teklif kimliğini döndür"""
+        products = ProductStore.coerce(products)
+        frame = products.frame
+        customer_key = fold_turkish(customer)
+        name_keys = [fold_turkish(name) for name in frame['name']]
+        with self._connect() as conn:
+            quote_id = conn.execute(
+                """INSERT INTO quotes (quote_no, created_at, customer, customer_key, contact,
+                                       product_count, total, cache_key, pdf, pricing)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (quote_no, created_at.strftime('%Y-%m-%d %H:%M:%S'), customer, customer_key,
+                 (contact or '').strip(), len(frame), products.totals()['line_total'], cache_key, pdf,
+                 json.dumps(pricing.to_dict()) if pricing is not None else None),
+            ).lastrowid
+            conn.executemany(
+                """INSERT INTO quote_items (quote_id, position, name, name_key, unit_price, vat_rate,
+                                           quantity, category)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (quote_id, position, name, name_key, unit_price, vat_rate,
+                     None if quantity != quantity else quantity, category)
+                    for position, (name_key, (name, unit_price, vat_rate, quantity, category))
+                    in enumerate(zip(name_keys, frame[['name', 'unit_price', 'vat_rate', 'quantity', 'category']]
+                                                .itertuples(index=False)))
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO quote_tokens (field, token, quote_id) VALUES (?, ?, ?)",
+                _quote_tokens(quote_id, customer_key, name_keys),
+            )
+        return quote_id
+
+    def find_by_cache_key(self, cache_key):
+        """Aynı içerikle daha önce arşivlenmiş teklifi döndür, yoksa None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(QUOTE_COLUMNS)} FROM quotes WHERE cache_key = ? ORDER BY id LIMIT 1",
+                (cache_key,),
+            ).fetchone()
+        return dict(zip(QUOTE_COLUMNS, row)) if row else None
+
+    def search(self, customer=None, product=None, date_from=None, date_to=None, limit=20, offset=0):
+        """Müşteri / ürün adı öneki ve tarih aralığına göre teklifleri sayfalı döndür
+
+        Önek adın başıyla ya da herhangi bir kelimesiyle eşleşebilir.
+        date_from dahil, date_to hariçtir. (teklifler, toplam sayı) döner.
+        """
+        where = []
+        params = []
+        for field, text in (('customer', customer), ('item', product)):
+            if text and fold_turkish(text):
+                where.append("id IN (SELECT quote_id FROM quote_tokens WHERE field = ? AND token >= ? AND token < ?)")
+                params.extend([field, *_prefix_range(fold_turkish(text))])
+        if date_from:
+            where.append("created_at >= ?")
+            params.append(date_from.strftime('%Y-%m-%d'))
+        if date_to:
+            where.append("created_at < ?")
+            params.append(date_to.strftime('%Y-%m-%d'))
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM quotes {clause}", params).fetchone()[0]
+            rows = conn.execute(
+                f"""SELECT {', '.join(QUOTE_COLUMNS)} FROM quotes {clause}
+                    ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?""",
+                [*params, limit, offset],
+            ).fetchall()
+        return [dict(zip(QUOTE_COLUMNS, row)) for row in rows], total
+
+    def get(self, quote_id):
+        """Teklif üst bilgileri, ürün deposu ve fiyatlandırma (yoksa None)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(QUOTE_COLUMNS)}, pricing FROM quotes WHERE id = ?", (quote_id,)
+            ).fetchone()
+            items = conn.execute(
+                """SELECT name, unit_price, vat_rate, quantity, category FROM quote_items
+                   WHERE quote_id = ? ORDER BY position""",
+                (quote_id,),
+            ).fetchall()
+        if row is None:
+            return None
+        quote = dict(zip(QUOTE_COLUMNS, row))
+        quote['pricing'] = Pricing.from_dict(json.loads(row[-1])) if row[-1] else None
+        quote['products'] = ProductStore.from_records(
+            {'name': name, 'unit_price': unit_price, 'vat_rate': vat_rate,
+             'quantity': quantity, 'category': category}
+            for name, unit_price, vat_rate, quantity, category in items
+        )
+        return quote
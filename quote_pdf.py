@@ -0,0 +1,526 @@
+"""Fiyat teklifi PDF'i oluşturma
+
+Streamlit arayüzünden bağımsızdır; toplu üretim ve diğer giriş noktaları
+aynı fonksiyonları kullanır. Font, filigran ve stiller süreç başına bir
+kez hazırlanır.
+"""
+import copy
+import hashlib
+import io
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Flowable
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.pdfbase import pdfmetrics
+from PIL import Image as PILImage
+
+import timings
+from fonts import resolve_font
+from pdf_output import CompactTTFont, WatermarkImage, binary_streams
+from product_store import ProductStore
+
+logger = logging.getLogger(__name__)
+
+BRAND_COLOR = colors.Color(0.86, 0.24, 0.26)
+CATEGORY_COLOR = colors.Color(0.97, 0.85, 0.85)
+
+# Teklif düzeni değiştiğinde artırılır (PDF önbellek anahtarına girer)
+TEMPLATE_VERSION = 3
+
+# Bu satır sayısının üstündeki teklifler sayfa sayfa bölünen tabloyla çizilir
+LARGE_QUOTE_ROWS = 100
+
+# Fiyatlandırma tablosunda bundan fazla fiyat sütunu varsa sayfa yatay çizilir
+PORTRAIT_PRICE_COLUMNS = 4
+
+
+# Türkçe destekli font yükleme
+# Türkçe font yüklenemediyse nedeni (arayüz uyarı gösterir)
+_font_error = None
+
+
+@lru_cache(maxsize=None)
+def load_turkish_font():
+    """Türkçe karakterleri destekleyen font yükle (ilk PDF oluşturulurken çağrılır)"""
+    try:
+        # DejaVu Sans: yerel klasör, sistem fontları, gerekirse önbelleğe indirme
+        with timings.span('pdf.fonts'):
+            font_path = resolve_font("DejaVuSans.ttf")
+            bold_font_path = resolve_font("DejaVuSans-Bold.ttf")
+
+            # ReportLab'a kaydet - gömülen alt kümeler küçültülür (pdf_output)
+            pdfmetrics.registerFont(CompactTTFont('TurkishFont', font_path))
+            pdfmetrics.registerFont(CompactTTFont('TurkishFont-Bold', bold_font_path))
+
+        return 'TurkishFont', 'TurkishFont-Bold'
+
+    except Exception as e:
+        global _font_error
+        _font_error = str(e)
+        logger.warning("Türkçe font yüklenemedi: %s. Standart font kullanılacak.", e)
+        return 'Helvetica', 'Helvetica-Bold'
+
+
+def font_error():
+    """Türkçe font yüklenemediyse hata metni, yüklendiyse None"""
+    load_turkish_font()
+    return _font_error
+
+
+# Logo filigranı
+LOGO_FILES = ['logo.png', 'logo.jpg', 'logo.jpeg', 'Logo.png', 'LOGO.png']
+
+
+@lru_cache(maxsize=8)
+def load_watermark(logo_path, mtime):
+    """Logo filigranını hazırla (dosya yolu + değişiklik zamanına göre önbelleklenir)"""
+    with timings.span('pdf.watermark'):
+        with PILImage.open(logo_path) as img:
+            img = img.convert('RGBA')
+            img.thumbnail((350, 350), PILImage.Resampling.LANCZOS)
+            canvas = PILImage.new('RGBA', (400, 400), (0, 0, 0, 0))
+            x = (400 - img.size[0]) // 2
+            y = (400 - img.size[1]) // 2
+            canvas.paste(img, (x, y), img)
+
+        # Şeffaflık - alfa kanalı tek adımda %25'e indirilir
+        alpha = canvas.getchannel('A').point(lambda a: int(a * 0.25))
+        canvas.putalpha(alpha)
+
+        # Sıkıştırılmış görüntü tüm belgelerde ve oturumlarda tekrar kullanılır
+        return WatermarkImage(canvas)
+
+
+def get_watermark():
+    """Bulunan ilk logo dosyasından filigranı döndür, logo yoksa None"""
+    for logo_file in LOGO_FILES:
+        if os.path.exists(logo_file):
+            try:
+                return load_watermark(logo_file, os.path.getmtime(logo_file))
+            except Exception:
+                continue
+    return None
+
+
+@lru_cache(maxsize=8)
+def _file_digest(path, mtime):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def get_logo_hash():
+    """Kullanılan logo dosyasının SHA-256 özeti, logo yoksa boş metin"""
+    for logo_file in LOGO_FILES:
+        if os.path.exists(logo_file):
+            return _file_digest(logo_file, os.path.getmtime(logo_file))
+    return ''
+
+
+def _tl(kurus):
+    return f"{kurus / 100:.2f} TL"
+
+
+class PagedProductTable(Flowable):
+    """Uzun teklifler için sayfa boyutlu parçalara bölünen ürün tablosu
+
+    Satır yükseklikleri sabittir; split() kalan alana sığan satır sayısını
+    hesaplayıp yalnızca o parça için küçük bir Table kurar. Her parçada
+    başlık tekrarlanır ve miktar girilmişse sayfa ara toplamı eklenir.
+    Büyük tablo hiçbir zaman bütün olarak ölçülmediği için süre ve bellek
+    satır sayısıyla doğrusal artar.
+
+    entries: (tür, hücreler, tutar kuruş) üçlüleri; tür 'row', 'category'
+    (kategori başlığı) ya da 'category_total' (kategori ara toplamı).
+    layout: QuoteTemplate.layout() değeri.
+    """
+
+    def __init__(self, template, entries, layout, on_rows=None):
+        super().__init__()
+        self.template = template
+        self.entries = entries
+        self.layout = layout
+        self.on_rows = on_rows  # on_rows(n): n ürün satırı daha yerleştirildi
+        self.headers, self.widths, self.header_height, self.row_height = template.table_metrics(layout)
+
+    def _height(self, count):
+        totals = self.row_height if self.layout is True else 0
+        return self.header_height + count * self.row_height + totals
+
+    def wrap(self, availWidth, availHeight):
+        self.width = sum(self.widths)
+        self.height = self._height(len(self.entries))
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        count = int((availHeight - self._height(0)) // self.row_height)
+        if count < 1:
+            return []
+        if count >= len(self.entries):
+            return [self]
+        # Kategori başlığı sayfa sonunda yalnız kalmasın
+        if count > 1 and self.entries[count - 1][0] == 'category':
+            count -= 1
+        chunk = self.entries[:count]
+        if self.on_rows:
+            self.on_rows(sum(1 for kind, _, _ in chunk if kind == 'row'))
+        return [self.template.chunk_table(chunk, self.layout),
+                PagedProductTable(self.template, self.entries[count:], self.layout, self.on_rows)]
+
+    def draw(self):
+        table = self.template.chunk_table(self.entries, self.layout)
+        table.wrapOn(self.canv, self.width, self.height)
+        table.drawOn(self.canv, 0, 0)
+
+
+class QuoteTemplate:
+    """Teklif şablonu
+
+    Stiller, tablo stili ve sabit içerik (başlık, notlar, teklif veren
+    bilgileri) bir kez hazırlanır; her çizimde yalnızca tarih, teklif no,
+    müşteri ve ürün satırları eklenir.
+    """
+
+    table_headers = ['Ürün Adı', 'Birim Fiyat\n(KDV Hariç)', 'KDV %', 'Birim Fiyat\n(KDV Dahil)']
+    col_widths = [6*cm, 3.5*cm, 2*cm, 3.5*cm]
+    # Miktar girilmişse tablo iki sütun genişler
+    quantity_headers = table_headers + ['Miktar', 'Tutar\n(KDV Dahil)']
+    quantity_col_widths = [4.5*cm, 2.5*cm, 1.5*cm, 2.5*cm, 1.8*cm, 2.7*cm]
+    # Fiyatlandırma tablosu: ad ve KDV sütunları sabit, kalan genişlik fiyat sütunlarına bölünür
+    pricing_col_widths = [4.5*cm, 1.5*cm]
+
+    notes = [
+        "Fiyatlar Türk Lirası cinsindendir.",
+        "Fiyatlar kilogram bazında verilmiştir.",
+        "Minimum sipariş miktarları için ayrıca bilgi verilecektir.",
+        "Teslim süresi sipariş onayından sonra belirlenecektir.",
+    ]
+
+    def __init__(self, font_normal, font_bold):
+        self.font_bold = font_bold
+        self._metrics = {}
+        self._columns = {}
+        # Stiller
+        self.styles = {
+            'company': ParagraphStyle('CompanyStyle', fontName=font_bold, fontSize=16,
+                                      spaceAfter=25, alignment=TA_CENTER, textColor=BRAND_COLOR),
+            'title': ParagraphStyle('TitleStyle', fontName=font_bold, fontSize=18,
+                                    spaceAfter=20, alignment=TA_CENTER, textColor=BRAND_COLOR),
+            'left': ParagraphStyle('LeftStyle', fontName=font_normal, fontSize=10,
+                                   spaceAfter=4, alignment=TA_LEFT, leftIndent=0),
+            'heading': ParagraphStyle('HeadingStyle', fontName=font_bold, fontSize=12,
+                                      spaceAfter=8, textColor=BRAND_COLOR),
+            'normal': ParagraphStyle('NormalStyle', fontName=font_normal, fontSize=10, spaceAfter=6),
+            'contact': ParagraphStyle('ContactStyle', fontName=font_bold, fontSize=11,
+                                      spaceAfter=8, alignment=TA_LEFT, textColor=BRAND_COLOR),
+        }
+        styles = self.styles
+
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), BRAND_COLOR),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), font_bold),
+            ('FONTNAME', (0, 1), (-1, -1), font_normal),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.Color(1, 0.95, 0.95), colors.white]),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ])
+
+        # Çok sütunlu fiyatlandırma tablosu için küçük yazı ve dar dolgu
+        self.compact_table_style = TableStyle(self.table_style.getCommands() + [
+            ('FONTSIZE', (0, 0), (-1, -1), 7),
+            ('LEFTPADDING', (0, 0), (-1, -1), 3),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ])
+
+        self.totals_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, -1), font_normal),
+            ('FONTNAME', (0, -1), (-1, -1), font_bold),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('LINEABOVE', (0, -1), (-1, -1), 1, BRAND_COLOR),
+            ('TEXTCOLOR', (0, -1), (-1, -1), BRAND_COLOR),
+        ])
+
+        # Sabit içerik - Gerçek Türkçe karakterlerle
+        company_name = "BULDUMLAR BİBER & BAHARAT ENT. TESİSLERİ"
+        self.header = [
+            Paragraph(company_name, styles['company']),
+            Paragraph("FİYAT TEKLİFİ", styles['title']),
+            Spacer(1, 15),
+        ]
+        self.customer_heading = Paragraph("SAYIN", styles['heading'])
+        self.price_list_heading = [
+            Paragraph("FİYAT LİSTESİ (Kilogram Bazında)", styles['heading']),
+            Spacer(1, 10),
+        ]
+
+        self.notes_spacer = Spacer(1, 25)
+        self.default_notes = self.notes_paragraph(self.notes)
+        self.footer = [
+            Spacer(1, 30),
+            # İLETİŞİM BİLGİLERİ
+            Paragraph("TEKLİF VEREN:", styles['contact']),
+            Paragraph("<b>Ertuğrul BULDUM</b>", styles['normal']),
+            Paragraph("Satış Direktörü", styles['normal']),
+            Spacer(1, 10),
+            Paragraph("<b>İletişim:</b> +90 530 078 06 46", styles['normal']),
+            Paragraph("E-mail: info@buldumlarbiber.com", styles['normal']),
+        ]
+
+    @staticmethod
+    def _clone(flowables):
+        # Ayrıştırılmış paragraflar paylaşılır, yerleşim durumu kopyada tutulur
+        return [copy.copy(f) for f in flowables]
+
+    def notes_paragraph(self, lines):
+        items = "<br/>".join(f"• {line}" for line in lines)
+        return Paragraph(f"<b>NOTLAR:</b><br/>{items}", self.styles['normal'])
+
+    @staticmethod
+    def layout(products, pricing=None):
+        """Tablo düzeni: miktar sütunları var/yok (True/False) ya da
+        fiyatlandırma tablosunun başlıkları (demet)"""
+        return pricing.headers() if pricing is not None else products.has_quantities
+
+    @staticmethod
+    def pagesize(layout):
+        """Fiyat sütunları dikey sayfaya sığmıyorsa yatay A4"""
+        if isinstance(layout, tuple) and len(layout) - 2 > PORTRAIT_PRICE_COLUMNS:
+            return landscape(A4)
+        return A4
+
+    def columns(self, layout):
+        """Düzene göre başlıklar, sütun genişlikleri ve tablo stili"""
+        if layout is True:
+            return self.quantity_headers, self.quantity_col_widths, self.table_style
+        if layout is False:
+            return self.table_headers, self.col_widths, self.table_style
+        columns = self._columns.get(layout)
+        if columns is None:
+            # Sayfa genişliği eksi SimpleDocTemplate'in varsayılan kenar boşlukları (2 x 1 inç)
+            width = self.pagesize(layout)[0] - 2 * 2.54*cm
+            fixed = self.pricing_col_widths
+            price_width = (width - sum(fixed)) / (len(layout) - len(fixed))
+            style = self.compact_table_style if price_width < 2.5*cm else self.table_style
+            columns = self._columns[layout] = (list(layout), fixed + [price_width] * (len(layout) - len(fixed)),
+                                               style)
+        return columns
+
+    def product_table(self, products, pricing=None):
+        """Ürün tablosu (başlık dahil), satırlar ürün deposundan ya da
+        fiyatlandırma matrisinden üretilir"""
+        layout = self.layout(products, pricing)
+        if len(products) > LARGE_QUOTE_ROWS:
+            return PagedProductTable(self, self.large_entries(products, layout, pricing), layout)
+        headers, widths, style = self.columns(layout)
+        rows = pricing.table_rows(products) if pricing is not None else products.table_rows(layout)
+        table = Table([headers] + rows, colWidths=widths, repeatRows=1)
+        table.setStyle(style)
+        return table
+
+    def table_metrics(self, layout):
+        """Başlıklar, sütun genişlikleri, başlık ve satır yüksekliği (bir kez ölçülür)"""
+        metrics = self._metrics.get(layout)
+        if metrics is None:
+            headers, widths, style = self.columns(layout)
+            sample = Table([headers, ['Ürün'] * len(headers)], colWidths=widths)
+            sample.setStyle(style)
+            sample.wrap(sum(widths), A4[1])
+            metrics = self._metrics[layout] = (headers, widths, *sample._rowHeights)
+        return metrics
+
+    def large_entries(self, products, layout, pricing=None):
+        """Uzun teklif satırları: kategoriye göre gruplu, kategori ara toplamlarıyla"""
+        with_quantities = layout is True
+        computed = products.computed()
+        # Hücreler tek satır kalmalı (sabit satır yüksekliği)
+        rows = pricing.table_rows(products) if pricing is not None else products.table_rows(with_quantities)
+        for row in rows:
+            row[0] = row[0].replace('\n', ' ')
+        amounts = np.where(computed['quantity'].notna(),
+                           np.rint(computed['line_total'].to_numpy() * 100), 0).astype(np.int64)
+        empty = [''] * (len(rows[0]) - 1)
+
+        categories = computed['category'].to_numpy()
+        if not categories.any():
+            return [('row', row, int(amount)) for row, amount in zip(rows, amounts)]
+
+        # Kategoriler ilk göründükleri sırayla, kategorisizler en sonda
+        codes, labels = pd.factorize(computed['category'].replace('', None), use_na_sentinel=True)
+        codes = np.where(codes < 0, len(labels), codes)
+        entries = []
+        for code in np.unique(codes):
+            positions = np.flatnonzero(codes == code)
+            label = labels[code] if code < len(labels) else 'Diğer'
+            entries.append(('category', [label, *empty], 0))
+            entries.extend(('row', rows[i], int(amounts[i])) for i in positions)
+            if with_quantities:
+                subtotal = int(amounts[positions].sum())
+                entries.append(('category_total', [f'{label} Ara Toplamı', *empty[:-1], _tl(subtotal)], 0))
+        return entries
+
+    def chunk_table(self, entries, layout):
+        """Tek sayfalık parça: başlık, satırlar ve miktar varsa sayfa ara toplamı"""
+        headers, widths, header_height, row_height = self.table_metrics(layout)
+        data = [headers] + [cells for _, cells, _ in entries]
+        commands = []
+        last = len(headers) - 1
+        for row, (kind, _, _) in enumerate(entries, 1):
+            if kind == 'category':
+                commands += [('SPAN', (0, row), (-1, row)), ('ALIGN', (0, row), (-1, row), 'LEFT'),
+                             ('BACKGROUND', (0, row), (-1, row), CATEGORY_COLOR),
+                             ('FONTNAME', (0, row), (-1, row), self.font_bold)]
+            elif kind == 'category_total':
+                commands += [('SPAN', (0, row), (last - 1, row)), ('ALIGN', (0, row), (-1, row), 'RIGHT'),
+                             ('FONTNAME', (0, row), (-1, row), self.font_bold)]
+        if layout is True:
+            page_total = sum(amount for kind, _, amount in entries if kind == 'row')
+            data.append(['Sayfa Ara Toplamı', *[''] * (last - 1), _tl(page_total)])
+            commands += [('SPAN', (0, -1), (last - 1, -1)), ('ALIGN', (0, -1), (-1, -1), 'RIGHT'),
+                         ('BACKGROUND', (0, -1), (-1, -1), colors.white),
+                         ('FONTNAME', (0, -1), (-1, -1), self.font_bold),
+                         ('TEXTCOLOR', (0, -1), (-1, -1), BRAND_COLOR)]
+        table = Table(data, colWidths=widths, rowHeights=[header_height] + [row_height] * (len(data) - 1),
+                      repeatRows=1)
+        table.setStyle(self.columns(layout)[2])
+        if commands:
+            table.setStyle(TableStyle(commands))
+        return table
+
+    def totals_table(self, products):
+        """KDV oranı bazında döküm ve genel toplam"""
+        rows = []
+        for rate, net, vat in products.vat_breakdown()[['vat_rate', 'net_total', 'vat_amount']].itertuples(index=False):
+            rows.append([f"Matrah (KDV %{rate:.0f})", f"{net:.2f} TL", f"KDV: {vat:.2f} TL"])
+        totals = products.totals()
+        rows.append(["Ara Toplam (KDV Hariç)", f"{totals['net_total']:.2f} TL", ""])
+        rows.append(["Toplam KDV", f"{totals['vat_amount']:.2f} TL", ""])
+        rows.append(["GENEL TOPLAM", f"{totals['line_total']:.2f} TL", ""])
+        table = Table(rows, colWidths=[5*cm, 3*cm, 3*cm], hAlign='RIGHT')
+        table.setStyle(self.totals_style)
+        return table
+
+    def story(self, customer, contact, products, today, quote_no, pricing=None):
+        """Belge akışını oluştur: sabit kısımlar kopyalanır, değişkenler eklenir"""
+        styles = self.styles
+        story = self._clone(self.header)
+
+        story.append(Paragraph(f"<b>Tarih:</b> {today.strftime('%d/%m/%Y')}", styles['left']))
+        story.append(Paragraph(f"<b>Teklif No:</b> {quote_no}", styles['left']))
+        story.append(Spacer(1, 20))
+
+        story.append(copy.copy(self.customer_heading))
+        customer_info = customer
+        if contact and contact.strip():
+            customer_info += f"<br/>Att: {contact}"
+        story.append(Paragraph(customer_info, styles['normal']))
+        story.append(Spacer(1, 20))
+
+        story.extend(self._clone(self.price_list_heading))
+
+        story.append(self.product_table(products, pricing))
+        # Fiyatlandırma tablosunda miktar ve toplam yoktur
+        if pricing is None and products.has_quantities:
+            story.append(Spacer(1, 10))
+            story.append(self.totals_table(products))
+
+        story.append(copy.copy(self.notes_spacer))
+        if pricing is None:
+            story.append(copy.copy(self.default_notes))
+        else:
+            story.append(self.notes_paragraph(pricing.notes() + self.notes[2:]))
+        story.extend(self._clone(self.footer))
+        return story
+
+    def render(self, customer, contact, products, today=None, watermark=None, quote_no=None, progress=None,
+               pricing=None):
+        """Teklifi bellekte PDF olarak oluşturup bayt döndür
+
+        pricing (pricing.Pricing) verilirse tablo para birimi x kademe
+        fiyatlarını gösterir. progress(olay, değer) verilirse yerleşim sürerken 'page' (bitmiş
+        sayfa sayısı) ve 'rows' (yerleştirilen ürün satırı) olaylarıyla
+        çağrılır; progress içinden atılan istisna çizimi durdurur.
+        """
+        today = today or datetime.now()
+        quote_no = quote_no or default_quote_no(today)
+        products = ProductStore.coerce(products)
+
+        # PDF oluştur - dosya sistemine yazılmaz, bellekte üretilir
+        pdf_buffer = io.BytesIO()
+        pagesize = self.pagesize(self.layout(products, pricing))
+        doc = SimpleDocTemplate(pdf_buffer, pagesize=pagesize, topMargin=2*cm, bottomMargin=2*cm)
+
+        # Logo ekleme fonksiyonu - filigran bir kez hazırlanır, her sayfada tekrar kullanılır
+        def add_logo_watermark(canvas, doc):
+            if watermark is not None:
+                try:
+                    page_width, page_height = doc.pagesize
+                    logo_size = 400
+                    x = (page_width - logo_size) / 2
+                    y = (page_height - logo_size) / 2
+                    watermark.draw(canvas, x, y, logo_size, logo_size)
+                except Exception:
+                    pass
+
+        # Akış ve tablolar burada kurulur; yerleşim ve çizim doc.build içinde yapılır
+        with timings.span('pdf.story', rows=len(products)):
+            story = self.story(customer, contact, products, today, quote_no, pricing)
+        if progress is not None:
+            rows_done = [0]
+
+            def on_rows(count):
+                rows_done[0] += count
+                progress('rows', rows_done[0])
+
+            for flowable in story:
+                if isinstance(flowable, PagedProductTable):
+                    flowable.on_rows = on_rows
+            doc.setProgressCallBack(lambda kind, value: progress('page', value) if kind == 'PAGE' else None)
+        # Akışlar ikili yazılır; useA85 yalnızca bu oluşturma süresince kapalı
+        with timings.span('pdf.build', rows=len(products)), binary_streams():
+            doc.build(story, onFirstPage=add_logo_watermark, onLaterPages=add_logo_watermark)
+        if progress is not None:
+            progress('rows', len(products))
+        return pdf_buffer.getvalue()
+
+
+@lru_cache(maxsize=None)
+def get_template():
+    """Süreç genelinde paylaşılan teklif şablonu"""
+    return QuoteTemplate(*load_turkish_font())
+
+
+def preload():
+    """Font, şablon ve filigranı önceden hazırla (işçi süreçleri için)"""
+    get_template()
+    get_watermark()
+
+
+def default_quote_no(today):
+    """Arşiv kullanılmadığında saat bazlı teklif numarası"""
+    return f"BLD-{today.strftime('%Y%m%d')}-{today.strftime('%H%M')}"
+
+
+def build_quote_pdf(customer, contact, products, today=None, quote_no=None, progress=None, pricing=None):
+    """Fiyat teklifi PDF'ini bellekte oluşturup bayt olarak döndür"""
+    return get_template().render(customer, contact, products, today, watermark=get_watermark(),
+                                 quote_no=quote_no, progress=progress, pricing=pricing)
@@ -0,0 +1,278 @@
+"""Arayüzsüz teklif PDF servisi
+
+Kullanım:
+    python quote_service.py --port 8502 -j 4
+
+POST /quotes gövdesi (JSON):
+    {"customer": "...", "contact": "...", "date": "2024-01-31" (isteğe bağlı),
+     "products": [{"name": "...", "unit_price": 120, "vat_rate": 1, "quantity": 5,
+                   "category": "..."}, ...],
+     "pricing": {"currencies": ["EUR", "USD"], "tiers": [[1, 0], [25, 5]]} (isteğe bağlı)}
+pricing verilirse kurlar teklif gününe göre kur tablosundan alınır
+(pricing.RATES_FILE); tiers [en az kg, indirim %] çiftleridir.
+Yanıt application/pdf'tir; teklif numarası X-Quote-No başlığında döner.
+GET /health işçi ve kuyruk durumunu JSON olarak, GET /metrics aşama
+sürelerini Prometheus metin biçiminde verir.
+
+PDF'ler sınırlı bir süreç havuzunda çizilir; her işçi font, şablon ve
+filigranı başlangıçta bir kez yükler. Bekleyen iş sayısı sınırı aşınca
+istek kuyruğa alınmaz, 503 ve Retry-After ile geri çevrilir.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import quote_pdf
+import timings
+from pricing import DEFAULT_TIERS, Pricing
+from product_store import ProductStore
+from quote_cache import QuoteCache
+from quote_history import QuoteHistory
+from quotes import issue_quote
+
+MAX_BODY_BYTES = 1024 * 1024
+RENDER_TIMEOUT = 60
+
+
+def parse_quote_request(payload):
+    """İstek gövdesini doğrula; (müşteri, ilgili kişi, ürün deposu, tarih, fiyatlandırma) döndür"""
+    if not isinstance(payload, dict):
+        raise ValueError("Gövde bir JSON nesnesi olmalı")
+    customer = str(payload.get('customer') or '').strip()
+    if not customer:
+        raise ValueError("'customer' alanı gerekli")
+    contact = str(payload.get('contact') or '').strip()
+
+    items = payload.get('products')
+    if not isinstance(items, list) or not items:
+        raise ValueError("'products' boş olmayan bir liste olmalı")
+    for position, item in enumerate(items, 1):
+        if not isinstance(item, dict) or not str(item.get('name') or '').strip():
+            raise ValueError(f"{position}. ürünün adı eksik")
+        try:
+            price = float(item.get('unit_price'))
+            vat_rate = float(item.get('vat_rate', 1.0))
+        except (TypeError, ValueError):
+            raise ValueError(f"{position}. ürünün fiyatı ya da KDV oranı sayı değil") from None
+        if price < 0 or not 0 <= vat_rate <= 100:
+            raise ValueError(f"{position}. ürünün fiyatı ya da KDV oranı geçersiz")
+    products = ProductStore.from_records(
+        {'name': item['name'], 'unit_price': item.get('unit_price'),
+         'vat_rate': item.get('vat_rate', 1.0), 'quantity': item.get('quantity'),
+         'category': item.get('category')}
+        for item in items
+    )
+
+    today = datetime.now()
+    if payload.get('date'):
+        try:
+            day = datetime.strptime(str(payload['date']), '%Y-%m-%d')
+        except ValueError:
+            raise ValueError("'date' YYYY-AA-GG biçiminde olmalı") from None
+        today = today.replace(year=day.year, month=day.month, day=day.day)
+
+    pricing = None
+    if payload.get('pricing') is not None:
+        spec = payload['pricing']
+        if not isinstance(spec, dict) or not isinstance(spec.get('currencies'), list):
+            raise ValueError("'pricing.currencies' bir liste olmalı")
+        try:
+            currencies = [str(c).strip().upper() for c in spec['currencies']]
+            tiers = [(float(min_kg), float(discount)) for min_kg, discount in spec.get('tiers', DEFAULT_TIERS)]
+        except (TypeError, ValueError):
+            raise ValueError("'pricing.tiers' [en az kg, indirim %] çiftlerinden oluşmalı") from None
+        pricing = Pricing.for_day(today, currencies, tiers)
+    return customer, contact, products, today, pricing
+
+
+class QuoteService:
+    """İşçi süreç havuzu, bekleyen iş sınırı, önbellek ve arşiv"""
+
+    def __init__(self, workers=None, max_pending=None, history=None, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.history = history
+        self.cache = cache
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self.stats = {'pending': 0, 'served': 0, 'rejected': 0, 'failed': 0}
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=quote_pdf.preload)
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            self.stats[name] += delta
+
+    def _release(self, future=None):
+        self._count('pending', -1)
+        self._slots.release()
+
+    def try_issue(self, customer, contact, products, today, pricing=None):
+        """Yer varsa teklifi oluştur; kuyruk doluysa None döndür
+
+        Yer, işçideki oluşturma bitince boşalır: zaman aşımında istek 504
+        ile döner ama süren iş yeni isteklere yer açmaz.
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            return None
+        self._count('pending')
+        futures = []
+
+        def render(customer, contact, products, today, quote_no, pricing=None):
+            future = self.pool.submit(quote_pdf.build_quote_pdf, customer, contact, products, today,
+                                      quote_no=quote_no, pricing=pricing)
+            futures.append(future)
+            return future.result(timeout=RENDER_TIMEOUT)
+
+        try:
+            result = issue_quote(customer, contact, products, today, history=self.history,
+                                 cache=self.cache, render=render, pricing=pricing)
+        except Exception:
+            self._count('failed')
+            raise
+        finally:
+            if futures:
+                # Bitmişse geri çağırma hemen çalışır
+                futures[-1].add_done_callback(self._release)
+            else:
+                self._release()
+        self._count('served')
+        return result
+
+    def health(self):
+        with self._lock:
+            return {'workers': self.workers, 'max_pending': self.max_pending, **self.stats}
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+class QuoteRequestHandler(BaseHTTPRequestHandler):
+    server_version = "FiyatTeklif/1.0"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.service.health())
+        elif self.path == '/metrics':
+            data = timings.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send_json(404, {'error': "Bulunamadı"})
+
+    def do_POST(self):
+        if self.path != '/quotes':
+            self._send_json(404, {'error': "Bulunamadı"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413 if length > MAX_BODY_BYTES else 400, {'error': "Geçersiz gövde boyutu"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length))
+            customer, contact, products, today, pricing = parse_quote_request(payload)
+        except ValueError as exc:  # JSONDecodeError da ValueError'dır
+            self._send_json(400, {'error': str(exc)})
+            return
+
+        try:
+            with timings.span('service.request', rows=len(products)):
+                result = self.service.try_issue(customer, contact, products, today, pricing)
+        except FutureTimeout:
+            self._send_json(504, {'error': "PDF zamanında oluşturulamadı"})
+            return
+        except Exception as exc:
+            self._send_json(500, {'error': f"PDF oluşturma hatası: {exc}"})
+            return
+        if result is None:
+            self._send_json(503, {'error': "Sunucu meşgul, lütfen tekrar deneyin"}, {'Retry-After': '1'})
+            return
+
+        quote_no, pdf = result
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(pdf)))
+        self.send_header('Content-Disposition', f'inline; filename="fiyat_teklifi_{quote_no}.pdf"')
+        self.send_header('X-Quote-No', quote_no)
+        self.end_headers()
+        self.wfile.write(pdf)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class QuoteHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Ani yüklerde bağlantılar sıfırlanmasın; fazlası 503 ile geri çevrilir
+    request_queue_size = 128
+
+
+def make_server(service, host='127.0.0.1', port=8502, quiet=False):
+    """Servisi verilen adreste dinleyen HTTP sunucusunu oluştur (port=0: boş port)"""
+    server = QuoteHTTPServer((host, port), QuoteRequestHandler)
+    server.service = service
+    server.quiet = quiet
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teklif PDF servisi")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="İşçi süreç sayısı")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="Aynı anda kabul edilen en fazla istek (varsayılan: 2 x işçi)")
+    parser.add_argument('--no-history', action='store_true', help="Teklifleri arşive kaydetme")
+    parser.add_argument('--no-cache', action='store_true', help="PDF önbelleğini kullanma")
+    parser.add_argument('--quiet', action='store_true', help="İstek günlüğünü yazma")
+    args = parser.parse_args(argv)
+
+    timings.configure_logging()
+    service = QuoteService(
+        workers=args.jobs,
+        max_pending=args.max_pending,
+        history=None if args.no_history else QuoteHistory(),
+        cache=None if args.no_cache else QuoteCache(),
+    )
+    server = make_server(service, args.host, args.port, quiet=args.quiet)
+    print(f"Teklif servisi http://{args.host}:{server.server_port}/quotes "
+          f"({service.workers} işçi, en fazla {service.max_pending} bekleyen istek)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Teklif oluşturma akışı
+
+Teklif numarası (arşiv sayacı ya da aynı içerikli eski teklif), PDF
+önbelleği ve arşive kayıt tek yerde yapılır; Streamlit düğmesi ve HTTP
+servisi aynı akışı kullanır. PDF yığını (reportlab, PIL) uygulama
+açılırken değil, ilk teklif oluşturulurken içe aktarılır.
+"""
+import timings
+from quote_cache import quote_key
+
+
+def _render_local(customer, contact, products, today, quote_no, pricing=None):
+    import quote_pdf
+
+    return quote_pdf.build_quote_pdf(customer, contact, products, today, quote_no=quote_no, pricing=pricing)
+
+
+def issue_quote(customer, contact, products, today, history=None, cache=None, render=None, pricing=None):
+    """Teklif numarasını belirleyip PDF'i oluştur (ya da önbellekten al), arşive ekle
+
+    Aynı girdilerle (aynı gün) daha önce arşivlenmiş teklif varsa onun
+    numarası kullanılır. render(customer, contact, products, today,
+    quote_no, pricing=...) PDF baytlarını döndürür; varsayılanı süreç içi
+    çizimdir. pricing (pricing.Pricing) verilirse teklif para birimi x
+    kademe fiyatlarıyla çizilir. (teklif numarası, PDF) döner.
+    """
+    render = render or _render_local
+    with timings.span('quote.key'):
+        cache_key = quote_key(customer, contact, products, today, pricing)
+    with timings.span('quote.number'):
+        archived = history.find_by_cache_key(cache_key) if history else None
+        if archived:
+            quote_no = archived['quote_no']
+        elif history:
+            quote_no = history.next_quote_no(today)
+        else:
+            import quote_pdf
+
+            quote_no = quote_pdf.default_quote_no(today)
+
+    with timings.span('quote.cache_get'):
+        pdf = cache.get(cache_key) if cache else None
+    if pdf is None:
+        with timings.span('quote.render', rows=len(products)):
+            pdf = render(customer, contact, products, today, quote_no, pricing=pricing)
+        if cache:
+            with timings.span('quote.cache_put'):
+                cache.put(cache_key, pdf)
+    if history and not archived:
+        with timings.span('quote.archive'):
+            history.record(quote_no, today, customer, contact, products, cache_key, pricing=pricing)
+    return quote_no, pdf
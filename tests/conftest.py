@@ -0,0 +1,14 @@
+"""Testler kullanıcının katalog / arşiv / önbellek dosyalarına dokunmaz
+
+Modüller bu yolları içe aktarılırken okuduğu için ortam değişkenleri
+testlerden önce, geçici bir klasöre yönlendirilir.
+"""
+import os
+import tempfile
+
+DATA_DIR = tempfile.mkdtemp(prefix='fiyat-test-')
+
+os.environ['FIYAT_CATALOG_DB'] = os.path.join(DATA_DIR, 'katalog.db')
+os.environ['FIYAT_HISTORY_DB'] = os.path.join(DATA_DIR, 'teklifler.db')
+os.environ['FIYAT_CACHE_DIR'] = os.path.join(DATA_DIR, 'cache')
+os.environ['FIYAT_RATES_FILE'] = os.path.join(DATA_DIR, 'kurlar.csv')
@@ -0,0 +1,38 @@
+"""Betik çalışmalarının süre toplayıcıları: st.rerun() ile biten çalışma da kapatılmalı"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import timings  # noqa: E402
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fiyat-uygulamasi.py')
+
+
+def test_rerun_closes_the_run_collector(monkeypatch):
+    runs = []
+    push = timings.push
+
+    def recording_push():
+        # Açık kalan toplayıcı sayısı ve bu çalışmanın ölçüm listesi
+        depth = len(timings._collectors.get())
+        spans, token = push()
+        runs.append((depth, spans))
+        return spans, token
+
+    monkeypatch.setattr(timings, 'push', recording_push)
+
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    next(e for e in at.text_input if e.label.startswith('Ürün Adı')).input('İsot')
+    # "Ürün Ekle" st.rerun() ile biter; ardından aynı iş parçacığında yeni çalışma başlar
+    next(b for b in at.button if 'Ürün Ekle' in b.label).click().run()
+    assert not at.exception
+
+    assert len(runs) == 3
+    assert [depth for depth, _ in runs] == [0, 0, 0]
+    for _, spans in runs:
+        assert [entry['span'] for entry in spans].count('ui.rerun') == 1
+        assert spans[-1]['span'] == 'ui.rerun'
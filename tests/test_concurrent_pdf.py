@@ -0,0 +1,68 @@
+"""Eşzamanlı PDF üretimi: iş parçacıkları birbirinin çıktısını bozmamalı"""
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quote_pdf  # noqa: E402
+from product_store import ProductStore  # noqa: E402
+
+THREADS = 8
+TODAY = datetime(2024, 1, 1, 12, 0)
+
+# Her üretimde değişen alanlar: belge kimliği ve oluşturma / değişiklik tarihleri
+VOLATILE = re.compile(rb'/ID\s*\[.*?\]|/(CreationDate|ModDate)\s*\(.*?\)', re.S)
+
+
+def normalize(pdf):
+    return VOLATILE.sub(b'', pdf)
+
+
+def make_quote(i):
+    products = ProductStore.from_records(
+        {'name': f'Ürün {i}-{j}', 'unit_price': 10.0 * (i + 1) + j, 'vat_rate': (1.0, 10.0, 20.0)[j % 3],
+         'quantity': j + 1 if i % 2 else None}
+        for j in range(5 + 3 * i)
+    )
+    return f'Müşteri {i}', f'İlgili {i}', products, TODAY, f'BLD-TEST-{i:03d}'
+
+
+def write_logo(path):
+    # Saydam köşeleri olan küçük renkli logo
+    logo = Image.new('RGBA', (120, 80), (0, 0, 0, 0))
+    for x in range(10, 110):
+        for y in range(10, 70):
+            logo.putpixel((x, y), (200, 2 * x % 256, 3 * y % 256, 255))
+    logo.save(path)
+
+
+def build(args):
+    customer, contact, products, today, quote_no = args
+    return quote_pdf.build_quote_pdf(customer, contact, products, today, quote_no=quote_no)
+
+
+def test_threaded_builds_match_serial_builds(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_logo(tmp_path / 'logo.png')
+    quote_pdf.load_watermark.cache_clear()
+    quotes = [make_quote(i) for i in range(THREADS)]
+    serial = [build(args) for args in quotes]
+    assert all(b'/Subtype /Image' in pdf for pdf in serial)
+
+    # Filigran iş parçacıklarında da ilk kez yüklensin
+    quote_pdf.load_watermark.cache_clear()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        threaded = list(pool.map(build, quotes * 2))
+
+    for i, pdf in enumerate(threaded):
+        assert pdf.startswith(b'%PDF')
+        assert normalize(pdf) == normalize(serial[i % THREADS])
+    # Teklifler birbirinden farklı olmalı (karışma olsaydı aynı çıkabilirdi)
+    assert len({normalize(pdf) for pdf in serial}) == THREADS
+    # PDF'ler bellekte üretilir, çalışma klasörüne logo dışında dosya yazılmaz
+    assert os.listdir(tmp_path) == ['logo.png']
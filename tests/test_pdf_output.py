@@ -0,0 +1,76 @@
+"""Küçültülen font alt kümeleri: glifler korunmalı, metin PDF'ten okunabilmeli"""
+import io
+import logging
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.pdfbase import pdfmetrics  # noqa: E402
+from reportlab.pdfbase.ttfonts import TTFontFace  # noqa: E402
+
+import pdf_output  # noqa: E402
+import quote_pdf  # noqa: E402
+
+ttLib = pytest.importorskip('fontTools.ttLib')
+
+TURKISH = 'İıŞşĞğÜüÖöÇç'
+TEXT = 'Fiyat Teklifi 0123456789 ' + TURKISH
+
+
+@pytest.fixture(scope='module')
+def face():
+    if quote_pdf.load_turkish_font()[0] != 'TurkishFont':
+        pytest.skip("DejaVu Sans bulunamadı")
+    return pdfmetrics.getFont('TurkishFont').face
+
+
+def subsets(face):
+    subset = list(range(32, 127)) + [ord(c) for c in TURKISH]
+    # Küçültülmemiş alt küme: reportlab'ın kendi makeSubset'i
+    plain = TTFontFace.makeSubset(face, subset)
+    return ttLib.TTFont(io.BytesIO(plain)), ttLib.TTFont(io.BytesIO(face.makeSubset(subset)))
+
+
+def test_compact_subset_round_trips_through_fonttools(face, caplog):
+    with caplog.at_level(logging.WARNING, logger='fontTools'):
+        plain, compact = subsets(face)
+        output = io.BytesIO()
+        compact.save(output)
+        reloaded = ttLib.TTFont(io.BytesIO(output.getvalue()))
+        glyf = reloaded['glyf']
+        for name in reloaded.getGlyphOrder():
+            glyf[name].expand(glyf)
+    assert not caplog.records
+
+    assert not set(pdf_output.HINTING_TABLES) & set(compact.keys())
+    assert {record.nameID for record in compact['name'].names} <= set(pdf_output.NAME_IDS)
+    assert compact.getGlyphOrder() == plain.getGlyphOrder()
+    # Glif şekilleri ve ölçüleri değişmez; yalnızca talimatlar çıkar
+    for name in plain.getGlyphOrder():
+        coordinates, end_points, flags = plain['glyf'][name].getCoordinates(plain['glyf'])
+        compact_coordinates, compact_end_points, _ = compact['glyf'][name].getCoordinates(compact['glyf'])
+        assert list(compact_coordinates) == list(coordinates), name
+        assert compact_end_points == end_points, name
+        assert compact['hmtx'][name] == plain['hmtx'][name], name
+        assert not getattr(compact['glyf'][name], 'program', None) or not compact['glyf'][name].program.getBytecode()
+    assert len(compact.getReverseGlyphMap()) == compact['maxp'].numGlyphs
+
+
+def test_pdf_text_extracts_with_turkish_glyphs(face):
+    pdfium = pytest.importorskip('pypdfium2')
+    products = [{'name': f'{TEXT} {i}', 'unit_price': 10 + i, 'vat_rate': 1} for i in range(3)]
+    pdf = quote_pdf.build_quote_pdf('Şükrü Öğüt Çiğköfte', 'İlgili', products, datetime(2024, 1, 1, 12, 0),
+                                    quote_no='BLD-TEST-001')
+    document = pdfium.PdfDocument(pdf)
+    try:
+        page = document[0]
+        text = page.get_textpage().get_text_range()
+    finally:
+        document.close()
+    assert 'Şükrü Öğüt Çiğköfte' in text
+    for i in range(3):
+        assert f'{TEXT} {i}' in text
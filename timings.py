@@ -0,0 +1,173 @@
+"""Aşama süreleri ve profil çıkarma
+
+Teklif üretiminin aşamaları (font, filigran, akış/tablo, doc.build,
+önbellek, arşiv) ve betik yeniden çalışmaları span() ile ölçülür. Her
+ölçüm:
+- "fiyat.timings" günlüğüne tek satırlık JSON olarak yazılır
+  (FIYAT_TIMING_LOG=1 ya da dosya yolu ile açılır),
+- süreç genelindeki histogramlara eklenir (prometheus_text),
+- etkin toplayıcılara (collect) eklenir.
+İşçi süreçlerdeki ölçümler o sürecin günlüğüne ve histogramlarına gider.
+"""
+import io
+import json
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger('fiyat.timings')
+
+# Histogram kova sınırları (saniye)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_collectors = ContextVar('timings_collectors', default=())
+_lock = threading.Lock()
+_histograms = {}
+
+
+def record(name, seconds, **fields):
+    """Ölçülmüş bir süreyi kaydet"""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = {'buckets': [0] * len(BUCKETS), 'count': 0, 'sum': 0.0}
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram['buckets'][i] += 1
+        histogram['count'] += 1
+        histogram['sum'] += seconds
+
+    entry = {'span': name, 'ms': round(seconds * 1000, 3), **fields}
+    for spans in _collectors.get():
+        spans.append(entry)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+@contextmanager
+def span(name, **fields):
+    """Bloğun süresini ölç ve record() ile kaydet"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, **fields)
+
+
+def push():
+    """Yeni bir toplayıcı başlat; (ölçüm listesi, belirteç) döndür"""
+    spans = []
+    return spans, _collectors.set(_collectors.get() + (spans,))
+
+
+def pop(token):
+    _collectors.reset(token)
+
+
+@contextmanager
+def collect():
+    """Blok içindeki ölçümleri listede topla (iç içe toplayıcılar desteklenir)"""
+    spans, token = push()
+    try:
+        yield spans
+    finally:
+        pop(token)
+
+
+def snapshot():
+    """Süreç genelindeki aşama özetleri: ad, sayı, toplam ve ortalama (ms)"""
+    with _lock:
+        return [
+            {'span': name, 'count': h['count'], 'total_ms': h['sum'] * 1000,
+             'avg_ms': h['sum'] * 1000 / h['count']}
+            for name, h in sorted(_histograms.items())
+        ]
+
+
+def prometheus_text():
+    """Histogramları Prometheus metin biçiminde döndür"""
+    lines = [
+        "# HELP fiyat_stage_seconds Teklif üretimi aşama süreleri",
+        "# TYPE fiyat_stage_seconds histogram",
+    ]
+    with _lock:
+        for name, h in sorted(_histograms.items()):
+            label = f'stage="{name}"'
+            for bound, count in zip(BUCKETS, h['buckets']):
+                lines.append(f'fiyat_stage_seconds_bucket{{{label},le="{bound:g}"}} {count}')
+            lines.append(f'fiyat_stage_seconds_bucket{{{label},le="+Inf"}} {h["count"]}')
+            lines.append(f'fiyat_stage_seconds_sum{{{label}}} {h["sum"]:.6f}')
+            lines.append(f'fiyat_stage_seconds_count{{{label}}} {h["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """/metrics adresini arka plan iş parçacığında sun"""
+    # Yalnızca FIYAT_METRICS_PORT verildiğinde gerekir; açılışta yüklenmez
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            data = prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name='fiyat-metrics').start()
+    return server
+
+
+def configure_logging(target=None):
+    """Ölçümleri JSON satırları olarak yaz
+
+    target: '1' / '-' standart hata, diğer değerler dosya yolu; verilmezse
+    FIYAT_TIMING_LOG ortam değişkeni okunur. Birden çok çağrı tek işleyici
+    ekler.
+    """
+    target = target if target is not None else os.environ.get('FIYAT_TIMING_LOG', '')
+    if not target or logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr) if target in ('1', '-') else logging.FileHandler(target, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+@contextmanager
+def profiled(limit=25):
+    """Bloğu cProfile ile çalıştır
+
+    Dönen sözlüğe blok bitince 'prof' (snakeviz / pstats ile açılabilen
+    .prof baytları) ve 'summary' (kümülatif süreye göre ilk satırlar) yazılır.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    result = {}
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        profiler.create_stats()
+        result['prof'] = marshal.dumps(profiler.stats)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+        result['summary'] = out.getvalue()